@@ -0,0 +1,252 @@
+"""Measure OmadaController.async_update against a synthetic site served by the in-process stand-in controller.
+
+Reports the wall time, CPU time and dispatcher fan-out of every poll and the peak memory allocated during a poll.
+Instead of the synthetic site, a cassette recorded from a real controller with record.py can be replayed.
+
+    python benchmarks/bench_poll.py --preset small
+    python benchmarks/bench_poll.py --aps 500 --clients 50000 --latency 0.02 --polls 5 --json results.json
+    python benchmarks/bench_poll.py --cassette site.jsonl.gz --site Default --realtime
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import logging
+import os
+import statistics
+import sys
+import tempfile
+import time
+import tracemalloc
+
+from dataclasses import asdict, dataclass
+from unittest.mock import patch
+
+from homeassistant import core, loader
+from homeassistant.bootstrap import async_load_base_functionality
+from homeassistant.config_entries import ConfigEntries, ConfigEntry
+from homeassistant.helpers import aiohttp_client
+from homeassistant.helpers.dispatcher import DATA_DISPATCHER
+from homeassistant.util import dt as dt_util
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, REPO_ROOT)
+
+from custom_components.omada.api.cassette import ReplaySession  # noqa: E402
+from fake_controller import FakeOmadaController, SyntheticSite, SITE_NAME  # noqa: E402
+
+REPLAY_URL = "https://omada.replay.invalid"
+
+PRESETS = {
+    "small": {"aps": 10, "clients": 100},
+    "large": {"aps": 500, "clients": 50000},
+}
+
+ALL_ENTITIES_OPTIONS = {
+    "enable_client_bandwidth_sensors": True,
+    "enable_client_uptime_sensors": True,
+    "enable_client_block_switch": True,
+    "enable_device_bandwidth_sensors": True,
+    "enable_device_radio_utilization_sensors": True,
+    "enable_device_controls": True,
+    "enable_device_statistics_sensors": True,
+    "enable_device_clients_sensors": True,
+}
+
+
+@dataclass
+class PollResult:
+    wall_time: float
+    cpu_time: float
+    requests: int
+    signals: int
+    receivers: int
+
+
+class DispatchCounter:
+    """Counts the signals sent by the integration and the receivers connected to them."""
+
+    def __init__(self, hass: core.HomeAssistant, module):
+        self._hass = hass
+        self._module = module
+        self._send = module.async_dispatcher_send
+        self.signals = 0
+        self.receivers = 0
+
+    def __enter__(self) -> DispatchCounter:
+        def counting_send(hass, signal, *args):
+            self.signals += 1
+            self.receivers += len(hass.data.get(DATA_DISPATCHER, {}).get(signal, ()))
+            self._send(hass, signal, *args)
+
+        self._module.async_dispatcher_send = counting_send
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self._module.async_dispatcher_send = self._send
+
+
+async def async_setup_hass(config_dir: str) -> core.HomeAssistant:
+    os.makedirs(os.path.join(config_dir, "custom_components"))
+    os.symlink(os.path.join(REPO_ROOT, "custom_components", "omada"),
+               os.path.join(config_dir, "custom_components", "omada"))
+
+    hass = core.HomeAssistant(config_dir)
+    loader.async_setup(hass)
+    hass.config_entries = ConfigEntries(hass, {})
+    await async_load_base_functionality(hass)
+    await hass.async_start()
+    return hass
+
+
+async def async_poll(hass, controller, fake: FakeOmadaController | ReplaySession) -> PollResult:
+    from custom_components.omada import controller as controller_module
+
+    # Make every collection due, as if each scan interval elapsed.
+    controller._last_polled.clear()
+    requests = fake.request_count
+
+    with DispatchCounter(hass, controller_module) as dispatch:
+        wall_start = time.perf_counter()
+        cpu_start = time.process_time()
+
+        await controller.async_update(dt_util.utcnow())
+        # Include the entity updates triggered by the poll.
+        await hass.async_block_till_done()
+
+        cpu_time = time.process_time() - cpu_start
+        wall_time = time.perf_counter() - wall_start
+
+    return PollResult(wall_time, cpu_time, fake.request_count - requests, dispatch.signals, dispatch.receivers)
+
+
+def summarize(values: list[float]) -> dict[str, float]:
+    return {"min": min(values), "median": statistics.median(values), "max": max(values)}
+
+
+async def async_run(args) -> dict:
+    if args.cassette:
+        site = None
+        fake = ReplaySession.from_file(args.cassette, realtime=args.realtime)
+        url = REPLAY_URL
+    else:
+        site = SyntheticSite(aps=args.aps, clients=args.clients, known_clients=args.known_clients)
+        fake = FakeOmadaController(site, latency=args.latency)
+        url = await fake.start()
+
+    def churn():
+        # Replayed polls change as the recorded ones did.
+        if site is not None:
+            site.churn(args.churn)
+
+    with tempfile.TemporaryDirectory() as config_dir:
+        hass = await async_setup_hass(config_dir)
+
+        entry = ConfigEntry(
+            version=1, minor_version=1, domain="omada", title="Benchmark", source="user",
+            data={"url": url, "site": args.site, "username": "admin", "password": "password", "verify_ssl": False},
+            options=ALL_ENTITIES_OPTIONS if args.all_entities else {})
+
+        setup_start = time.perf_counter()
+        if args.cassette:
+            with patch.object(aiohttp_client, "async_create_clientsession", lambda *args, **kwargs: fake):
+                await hass.config_entries.async_add(entry)
+                await hass.async_block_till_done()
+        else:
+            await hass.config_entries.async_add(entry)
+            await hass.async_block_till_done()
+        setup_time = time.perf_counter() - setup_start
+
+        controller = hass.data["omada"][entry.entry_id]
+        api = controller.api
+
+        polls = []
+        for _ in range(args.polls):
+            churn()
+            polls.append(await async_poll(hass, controller, fake))
+
+        # Measured separately as tracing allocations slows everything down.
+        churn()
+        tracemalloc.start()
+        await async_poll(hass, controller, fake)
+        _, peak_memory = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+
+        results = {
+            "site": {"aps": len(api.devices), "clients": len(api.clients),
+                     "known_clients": len(api.known_clients), "latency": args.latency,
+                     "cassette": args.cassette, "realtime": args.realtime},
+            "setup_time": setup_time,
+            "entities": len(hass.states.async_all()),
+            "wall_time": summarize([poll.wall_time for poll in polls]),
+            "cpu_time": summarize([poll.cpu_time for poll in polls]),
+            "peak_memory": peak_memory,
+            "polls": [asdict(poll) for poll in polls],
+        }
+
+        await hass.config_entries.async_unload(entry.entry_id)
+        await hass.async_stop()
+
+    if site is not None:
+        await fake.stop()
+    elif fake.unmatched:
+        logging.warning("%d requests had no recorded response", fake.unmatched)
+
+    return results
+
+
+def print_results(results: dict) -> None:
+    site = results["site"]
+    if site["cassette"]:
+        latency = "recorded latency" if site["realtime"] else "replayed at full speed"
+    else:
+        latency = f"{site['latency'] * 1000:.0f}ms latency"
+    print(f"Site: {site['aps']} APs, {site['clients']} clients, {site['known_clients']} known clients, {latency}")
+    print(f"Setup: {results['setup_time']:.3f}s, {results['entities']} entities")
+    for name in ("wall_time", "cpu_time"):
+        summary = results[name]
+        print(f"Poll {name.replace('_', ' ')}: min {summary['min']:.3f}s, median {summary['median']:.3f}s, "
+              f"max {summary['max']:.3f}s")
+    print(f"Poll peak memory: {results['peak_memory'] / 1024 / 1024:.1f} MiB")
+    print("Poll  wall (s)  cpu (s)  requests  signals  receivers")
+    for index, poll in enumerate(results["polls"], start=1):
+        print(f"{index:>4}  {poll['wall_time']:>8.3f}  {poll['cpu_time']:>7.3f}  {poll['requests']:>8}  "
+              f"{poll['signals']:>7}  {poll['receivers']:>9}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--preset", choices=PRESETS, help="site size preset, overridden by --aps and --clients")
+    parser.add_argument("--aps", type=int)
+    parser.add_argument("--clients", type=int)
+    parser.add_argument("--known-clients", type=int, help="defaults to the number of clients")
+    parser.add_argument("--latency", type=float, default=0.0, help="seconds added to every request")
+    parser.add_argument("--polls", type=int, default=5)
+    parser.add_argument("--churn", type=float, default=0.1, help="fraction of clients changing between polls")
+    parser.add_argument("--all-entities", action="store_true", help="enable every optional entity type")
+    parser.add_argument("--cassette", help="replay a cassette recorded with record.py instead of a synthetic site")
+    parser.add_argument("--site", default=SITE_NAME, help="name of the site the cassette was recorded for")
+    parser.add_argument("--realtime", action="store_true", help="replay with the recorded latencies")
+    parser.add_argument("--json", help="also write the results to this file")
+    args = parser.parse_args()
+
+    preset = PRESETS[args.preset or "small"]
+    args.aps = args.aps if args.aps is not None else preset["aps"]
+    args.clients = args.clients if args.clients is not None else preset["clients"]
+
+    logging.basicConfig(level=logging.WARNING)
+
+    results = asyncio.run(async_run(args))
+    print_results(results)
+
+    if args.json:
+        with open(args.json, "w") as file:
+            json.dump(results, file, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,255 @@
+"""Microbenchmarks of APIItems._process_raw and the Client and Device property accessors.
+
+Every case processes a snapshot of the collection while the previous snapshot is stored, with a fraction of the items
+changed in between (the churn). Of the churned items one in ten is replaced by a new item, the rest change counters.
+
+    python benchmarks/bench_process_raw.py run
+    python benchmarks/bench_process_raw.py run --sizes 1000 10000 --json results.json
+    python benchmarks/bench_process_raw.py run --save benchmarks/baselines/process_raw.json
+    python benchmarks/bench_process_raw.py run --baseline benchmarks/baselines/process_raw.json
+    python benchmarks/bench_process_raw.py compare benchmarks/baselines/process_raw.json results.json
+
+Cases are compared on their fastest run, which is the least affected by other load on the machine. Comparing exits with
+status 1 when a case got slower than the baseline by more than the threshold. Baselines are only comparable on the
+machine they were measured on, so measure a fresh baseline before starting an optimisation.
+"""
+
+from __future__ import annotations
+
+import argparse
+import gc
+import json
+import os
+import platform
+import random
+import statistics
+import sys
+import time
+
+from typing import Any, Callable
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from custom_components.omada.api.api import APIItems  # noqa: E402
+from custom_components.omada.api.clients import Clients  # noqa: E402
+from custom_components.omada.api.devices import Devices  # noqa: E402
+from fake_controller import SyntheticSite  # noqa: E402
+
+DEFAULT_SIZES = (1000, 10000, 100000)
+DEFAULT_CHURN = (0.0, 0.01, 0.1, 0.5)
+DEFAULT_THRESHOLD = 0.2
+
+# Small cases are run more often than requested, until at least this many items were processed, to reduce noise.
+MIN_ITEMS_PROCESSED = 200000
+
+# Fraction of the churned items that are replaced by new items instead of changing counters.
+REPLACED_FRACTION = 0.1
+
+
+def client_snapshots(size: int, churn: float, seed: int = 0) -> tuple[list[dict], list[dict]]:
+    site = SyntheticSite(aps=max(1, size // 100), clients=size, known_clients=0, seed=seed)
+    return _churned(site.clients, churn, seed, ("trafficDown", "trafficUp", "activity", "lastSeen"))
+
+
+def device_snapshots(size: int, churn: float, seed: int = 0) -> tuple[list[dict], list[dict]]:
+    site = SyntheticSite(aps=size, clients=0, seed=seed)
+    return _churned(site.devices, churn, seed, ("upload", "download", "clientNum", "lastSeen"))
+
+
+def _churned(items: list[dict], churn: float, seed: int, counters: tuple[str, ...]) -> tuple[list[dict], list[dict]]:
+    """Return the items and a copy of them with a fraction changed."""
+
+    rng = random.Random(seed)
+    after = [dict(item) for item in items]
+    churned = rng.sample(range(len(items)), int(len(items) * churn))
+    replaced = int(len(churned) * REPLACED_FRACTION)
+
+    for position, index in enumerate(churned):
+        item = after[index]
+        if position < replaced:
+            # A new item taking the place of an old one, the old one is removed.
+            item["mac"] = "EE" + item["mac"][2:]
+        else:
+            for counter in counters:
+                item[counter] = (item[counter] or 0) + rng.randrange(1, 1 << 20)
+
+    return items, after
+
+
+def _properties(item_cls: type) -> list[str]:
+    return sorted(name for cls in item_cls.__mro__ for name, value in vars(cls).items()
+                  if isinstance(value, property))
+
+
+def _timed(func: Callable[[], Any], repeat: int) -> list[float]:
+    timings = []
+    gc_enabled = gc.isenabled()
+    gc.disable()
+    try:
+        for _ in range(repeat):
+            start = time.perf_counter()
+            func()
+            timings.append(time.perf_counter() - start)
+    finally:
+        if gc_enabled:
+            gc.enable()
+    return timings
+
+
+def bench_process_raw(items: APIItems, before: list[dict], after: list[dict], repeat: int) -> list[float]:
+    """Time processing alternately the snapshot after and before the churn, so every run sees the same changes."""
+
+    items._process_raw(before)
+    snapshots = [after, before]
+    runs = iter(range(repeat))
+
+    def process():
+        items._process_raw(snapshots[next(runs) % 2])
+
+    return _timed(process, repeat)
+
+
+def bench_properties(items: APIItems, repeat: int) -> list[float]:
+    """Time reading every property of every item."""
+
+    names = _properties(items._item_cls)
+    collection = list(items.items.values())
+
+    def read_all():
+        for item in collection:
+            for name in names:
+                getattr(item, name)
+
+    return _timed(read_all, repeat)
+
+
+COLLECTIONS = {
+    "clients": (lambda: Clients(None, compact=True), client_snapshots),
+    "devices": (lambda: Devices(None, compact=True), device_snapshots),
+}
+
+
+def _summary(timings: list[float], size: int) -> dict[str, float]:
+    fastest = min(timings)
+    return {"min": fastest, "median": statistics.median(timings), "runs": len(timings),
+            "per_item_us": fastest / size * 1e6 if size else 0.0}
+
+
+def _report(name: str, result: dict[str, float]) -> None:
+    print(f"{name:<40} min {result['min'] * 1000:>9.3f}ms  median {result['median'] * 1000:>9.3f}ms  "
+          f"{result['per_item_us']:>7.3f}us/item", flush=True)
+
+
+def run(sizes: list[int], churn_rates: list[float], repeat: int, collections: list[str]) -> dict:
+    cases = {}
+
+    for collection in collections:
+        factory, snapshots = COLLECTIONS[collection]
+
+        for size in sizes:
+            runs = max(repeat, MIN_ITEMS_PROCESSED // max(1, size))
+
+            for churn in churn_rates:
+                before, after = snapshots(size, churn)
+                items = factory()
+                timings = bench_process_raw(items, before, after, runs)
+                name = f"{collection}/process_raw/{size}/churn={churn:g}"
+                cases[name] = _summary(timings, size)
+                _report(name, cases[name])
+
+            items = factory()
+            items._process_raw(snapshots(size, 0.0)[0])
+            timings = bench_properties(items, runs)
+            name = f"{collection}/properties/{size}"
+            cases[name] = _summary(timings, size)
+            _report(name, cases[name])
+
+    return {
+        "machine": {"python": platform.python_version(), "implementation": platform.python_implementation(),
+                    "platform": platform.platform(), "processor": platform.processor() or platform.machine()},
+        "repeat": repeat,
+        "cases": cases,
+    }
+
+
+def compare(baseline: dict, current: dict, threshold: float) -> list[str]:
+    """Print how every case changed against the baseline. Returns the cases slower by more than the threshold."""
+
+    regressions = []
+
+    if baseline.get("machine") != current.get("machine"):
+        print("Warning: the baseline was measured on a different machine or Python, timings may not be comparable.")
+
+    for name, result in current["cases"].items():
+        if name not in baseline["cases"]:
+            print(f"{name:<40} new")
+            continue
+
+        previous = baseline["cases"][name]["min"]
+        change = result["min"] / previous - 1 if previous else 0.0
+        regressed = change > threshold
+        if regressed:
+            regressions.append(name)
+        print(f"{name:<40} {previous * 1000:>9.3f}ms -> {result['min'] * 1000:>9.3f}ms  {change:>+7.1%}"
+              f"{'  REGRESSION' if regressed else ''}")
+
+    if not_run := len(baseline["cases"].keys() - current["cases"].keys()):
+        print(f"{not_run} baseline case(s) were not run")
+
+    return regressions
+
+
+def _load(path: str) -> dict:
+    with open(path) as file:
+        return json.load(file)
+
+
+def _save(path: str, results: dict) -> None:
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    with open(path, "w") as file:
+        json.dump(results, file, indent=2, sort_keys=True)
+        file.write("\n")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    run_parser = commands.add_parser("run", help="run the benchmarks")
+    run_parser.add_argument("--sizes", type=int, nargs="+", default=DEFAULT_SIZES)
+    run_parser.add_argument("--churn", type=float, nargs="+", default=DEFAULT_CHURN)
+    run_parser.add_argument("--repeat", type=int, default=7, help="minimum number of runs of every case")
+    run_parser.add_argument("--collections", nargs="+", choices=COLLECTIONS, default=list(COLLECTIONS))
+    run_parser.add_argument("--json", help="write the results to this file")
+    run_parser.add_argument("--save", help="write the results to this file as the new baseline")
+    run_parser.add_argument("--baseline", help="compare the results against this baseline")
+    run_parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD)
+
+    compare_parser = commands.add_parser("compare", help="compare saved results against a baseline")
+    compare_parser.add_argument("baseline")
+    compare_parser.add_argument("results")
+    compare_parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD,
+                                help="relative slowdown flagged as a regression, 0.2 is 20%%")
+
+    args = parser.parse_args()
+
+    if args.command == "run":
+        results = run(args.sizes, args.churn, args.repeat, args.collections)
+        for path in (args.json, args.save):
+            if path:
+                _save(path, results)
+        baseline = _load(args.baseline) if args.baseline else None
+    else:
+        results = _load(args.results)
+        baseline = _load(args.baseline)
+
+    if baseline is not None:
+        print()
+        if regressions := compare(baseline, results, args.threshold):
+            print(f"{len(regressions)} case(s) regressed by more than {args.threshold:.0%}")
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
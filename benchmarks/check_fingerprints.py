@@ -0,0 +1,91 @@
+"""Check that collections skipping unchanged responses end up with what the controller serves.
+
+Runs sequences of updates against the stand-in controller where a response matches one seen before an update that
+was fetched without being skippable, e.g. after the collection was empty or a paged walk failed. Exits with status 1
+when a collection holds different items than the controller served last.
+
+    python benchmarks/check_fingerprints.py
+"""
+
+from __future__ import annotations
+
+import asyncio
+import os
+import sys
+
+import aiohttp
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from custom_components.omada.api.controller import Controller  # noqa: E402
+from custom_components.omada.api.errors import OmadaApiException  # noqa: E402
+from fake_controller import FakeOmadaController, SyntheticSite, SITE_NAME  # noqa: E402
+
+
+async def check_unpaged_devices(controller: Controller, site: SyntheticSite) -> list[str]:
+    """Devices [A], [A], [], [A], [] must end up empty."""
+
+    device = site.devices[0]
+    for devices in ([device], [device], [], [device], []):
+        site.devices[:] = devices
+        await controller.devices.update()
+
+    if len(controller.devices):
+        return [f"devices: expected none, got {sorted(controller.devices.items)}"]
+    return []
+
+
+async def check_paged_clients_after_failure(controller: Controller, site: SyntheticSite,
+                                            fake: FakeOmadaController) -> list[str]:
+    """Clients A, a walk failing on page 2, B, A must end up with A."""
+
+    client = site.clients[0]
+    controller.clients.page_size = 1
+
+    client["ssid"] = "x"
+    await controller.clients.update()
+
+    fake.fail_next(lambda request: request.path.endswith("/clients") and request.query.get("currentPage") == "2")
+    try:
+        await controller.clients.update()
+    except OmadaApiException:
+        pass
+
+    client["ssid"] = "y"
+    await controller.clients.update()
+
+    client["ssid"] = "x"
+    await controller.clients.update()
+
+    if (ssid := controller.clients[client["mac"]].ssid) != "x":
+        return [f"clients: expected ssid 'x' for {client['mac']}, got {ssid!r}"]
+    return []
+
+
+async def async_check() -> list[str]:
+    site = SyntheticSite(aps=1, clients=2, known_clients=0)
+    fake = FakeOmadaController(site)
+    url = await fake.start()
+
+    try:
+        async with aiohttp.ClientSession(cookie_jar=aiohttp.CookieJar(unsafe=True)) as session:
+            controller = Controller(url, "admin", "password", session, site=SITE_NAME)
+            await controller.login()
+
+            return (await check_unpaged_devices(controller, site) +
+                    await check_paged_clients_after_failure(controller, site, fake))
+    finally:
+        await fake.stop()
+
+
+def main() -> None:
+    if failures := asyncio.run(async_check()):
+        for failure in failures:
+            print(failure)
+        sys.exit(1)
+    print("OK")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,208 @@
+"""In-process stand-in for an Omada controller (v5 API) serving a synthetic site."""
+
+from __future__ import annotations
+
+import asyncio
+import random
+
+from typing import Callable
+
+from aiohttp import web
+
+CONTROLLER_ID = "0123456789abcdef0123456789abcdef"
+SITE_ID = "0123456789abcdef01234567"
+SITE_NAME = "Default"
+CONTROLLER_VERSION = "5.13.30"
+TOKEN = "benchmark-token"
+
+
+def _mac(prefix: int, index: int) -> str:
+    return "{:02X}-{:02X}-{:02X}-{:02X}-{:02X}-{:02X}".format(
+        prefix, 0x10, (index >> 16) & 0xFF, (index >> 8) & 0xFF, index & 0xFF, 0x01)
+
+
+def _radio(index: int) -> dict:
+    return {"rdMode": "11ax", "bandWidth": "80MHz", "txPower": 20,
+            "txUtil": index % 30, "rxUtil": index % 20, "interUtil": index % 10}
+
+
+class SyntheticSite:
+    """Devices, clients and WLANs of a site. Raw items carry the fields real controllers return, not just the used ones."""
+
+    def __init__(self, aps: int = 10, clients: int = 100, known_clients: int | None = None, wlans: int = 2,
+                 ssids_per_wlan: int = 2, seed: int = 0):
+        self._random = random.Random(seed)
+        self.now = 1700000000000
+
+        self.wlans = [{"id": f"wlan{index:020d}", "name": f"WLAN {index}"} for index in range(wlans)]
+        self.ssids = {wlan["id"]: [{"id": f"{wlan['id']}-{ssid}", "name": f"SSID {wlan_index}-{ssid}"}
+                                   for ssid in range(ssids_per_wlan)]
+                      for wlan_index, wlan in enumerate(self.wlans)}
+
+        self.devices = [self._device(index) for index in range(aps)]
+        self.clients = [self._client(index) for index in range(clients)]
+
+        known_clients = max(clients, known_clients if known_clients is not None else clients)
+        self.known_clients = [self._known_client(index) for index in range(known_clients)]
+
+    def _device(self, index: int) -> dict:
+        return {
+            "type": "ap", "mac": _mac(0xAA, index), "name": f"ap-{index}", "model": "EAP660 HD",
+            "compoundModel": "EAP660 HD(EU) v1.0", "showModel": "EAP660 HD", "firmwareVersion": "1.0.0",
+            "version": "1.0.0", "hwVersion": "1.0", "needUpgrade": False, "status": 14, "statusCategory": 1,
+            "ip": f"10.0.{index // 250}.{index % 250 + 1}", "uptime": "1day(s) 1h 1m 1s", "uptimeLong": 90061,
+            "cpuUtil": 5, "memUtil": 40, "wirelessLinked": False, "uplink": None, "site": SITE_NAME,
+            "clientNum": 0, "clientNum2g": 0, "clientNum5g": 0, "clientNum6g": 0, "guestNum": 0, "userNum": 0,
+            "upload": 0, "download": 0, "txRate": 0, "rxRate": 0, "lastSeen": self.now, "locateEnable": False,
+            "deviceMisc": {"support5g": True, "support6g": False, "supportMesh": True, "supportBandSteering": True},
+            "radioSetting2g": {"radioEnable": True, "channelWidth": "2", "channel": "0", "txPower": 20},
+            "radioSetting5g": {"radioEnable": True, "channelWidth": "5", "channel": "0", "txPower": 20},
+            "wp2g": _radio(index), "wp5g": _radio(index + 1),
+        }
+
+    def _client(self, index: int) -> dict:
+        ap = self.devices[index % len(self.devices)] if self.devices else None
+        ssid = self.ssids[self.wlans[0]["id"]][index % len(self.ssids[self.wlans[0]["id"]])]["name"] \
+            if self.wlans else ""
+        return {
+            "mac": _mac(0xCC, index), "name": f"client-{index}", "hostName": f"client-{index}",
+            "deviceType": "unknown", "ip": f"10.1.{index // 250}.{index % 250 + 1}", "connectType": 1,
+            "connectDevType": "ap", "wireless": True, "ssid": ssid, "signalLevel": 80, "signalRank": 4,
+            "wifiMode": 5, "apName": ap["name"] if ap else "", "apMac": ap["mac"] if ap else "", "radioId": 1,
+            "channel": 36, "rxRate": 866000, "txRate": 866000, "powerSave": False, "rssi": -50, "activity": 0,
+            "trafficDown": self._random.randrange(1 << 30), "trafficUp": self._random.randrange(1 << 28),
+            "uptime": 3600, "lastSeen": self.now, "authStatus": 0, "guest": index % 10 == 0, "active": True,
+            "manager": False, "downPacket": 1000, "upPacket": 1000, "vid": 0, "dot1xVlan": 0, "snr": 45,
+            "osName": "", "systemName": "", "description": "", "support5g": True, "support6g": False,
+        }
+
+    def _known_client(self, index: int) -> dict:
+        return {
+            "mac": _mac(0xCC, index), "name": f"client-{index}", "wireless": True, "guest": index % 10 == 0,
+            "download": self._random.randrange(1 << 34), "upload": self._random.randrange(1 << 32),
+            "duration": 86400, "lastSeen": self.now - index * 1000, "block": False, "manager": False,
+        }
+
+    def churn(self, fraction: float = 0.1) -> None:
+        """Advance time and change the counters of a fraction of the clients, as happens between polls."""
+        self.now += 30000
+        changed = self._random.sample(range(len(self.clients)), int(len(self.clients) * fraction))
+        for index in changed:
+            client = self.clients[index]
+            client["trafficDown"] += self._random.randrange(1 << 20)
+            client["trafficUp"] += self._random.randrange(1 << 18)
+            client["activity"] = self._random.randrange(1 << 16)
+            client["lastSeen"] = self.now
+            if index < len(self.known_clients):
+                self.known_clients[index]["lastSeen"] = self.now
+        for device in self.devices:
+            device["upload"] += self._random.randrange(1 << 20)
+            device["download"] += self._random.randrange(1 << 20)
+
+
+class FakeOmadaController:
+    """Serves a SyntheticSite over HTTP, adding latency to every request."""
+
+    def __init__(self, site: SyntheticSite, latency: float = 0.0):
+        self.site = site
+        self.latency = latency
+        self.request_count = 0
+        self.response_bytes = 0
+        # Requests matching one of these fail once with an internal server error, see fail_next.
+        self._failures: list[Callable[[web.Request], bool]] = []
+        self._runner: web.AppRunner | None = None
+
+        self.app = web.Application()
+        self.app.router.add_route("*", "/{tail:.*}", self._handle)
+
+    async def start(self, host: str = "127.0.0.1", port: int = 0) -> str:
+        """Start serving and return the controller url."""
+        self._runner = web.AppRunner(self.app, access_log=None)
+        await self._runner.setup()
+        tcp_site = web.TCPSite(self._runner, host, port)
+        await tcp_site.start()
+        port = self._runner.addresses[0][1]
+        return f"http://{host}:{port}"
+
+    async def stop(self) -> None:
+        if self._runner is not None:
+            await self._runner.cleanup()
+            self._runner = None
+
+    def fail_next(self, matches: Callable[[web.Request], bool]) -> None:
+        """Fail the next request matching a predicate."""
+        self._failures.append(matches)
+
+    def _result(self, result) -> web.Response:
+        response = web.json_response({"errorCode": 0, "msg": "Success.", "result": result})
+        self.response_bytes += len(response.body)
+        return response
+
+    @staticmethod
+    def _page(request: web.Request, items: list) -> dict:
+        page = int(request.query.get("currentPage", 1))
+        size = int(request.query.get("currentPageSize", 10))
+        return {"totalRows": len(items), "currentPage": page, "currentSize": size,
+                "data": items[(page - 1) * size:page * size]}
+
+    async def _handle(self, request: web.Request) -> web.Response:
+        self.request_count += 1
+        if self.latency:
+            await asyncio.sleep(self.latency)
+
+        for matches in self._failures:
+            if matches(request):
+                self._failures.remove(matches)
+                raise web.HTTPInternalServerError()
+
+        path = request.path
+        if path == "/api/info":
+            return self._result({"controllerVer": CONTROLLER_VERSION, "apiVer": "3", "omadacId": CONTROLLER_ID})
+
+        prefix = f"/{CONTROLLER_ID}/api/v2"
+        if not path.startswith(prefix):
+            raise web.HTTPNotFound()
+        path = path[len(prefix):]
+
+        if path == "/login":
+            return self._result({"roleType": 0, "token": TOKEN})
+        if request.headers.get("Csrf-Token") != TOKEN:
+            return web.json_response({"errorCode": -1200, "msg": "Login required."})
+        if path == "/users/current":
+            return self._result({"privilege": {"sites": [{"name": SITE_NAME, "key": SITE_ID}]}})
+        if path == "/maintenance/controllerStatus":
+            return self._result({"name": "Benchmark Controller", "macAddress": "00-00-00-00-00-00"})
+
+        site_prefix = f"/sites/{SITE_ID}"
+        if not path.startswith(site_prefix):
+            raise web.HTTPNotFound()
+        path = path[len(site_prefix):]
+        parts = path.strip("/").split("/")
+
+        if path == "/devices":
+            return self._result(self.site.devices)
+        if path == "/clients":
+            return self._result(self._page(request, self.site.clients))
+        if path == "/insight/clients":
+            known_clients = self.site.known_clients
+            if request.query.get("sorts.lastSeen") == "desc":
+                known_clients = sorted(known_clients, key=lambda client: -client["lastSeen"])
+            return self._result(self._page(request, known_clients))
+        if parts[0] == "eaps" and len(parts) == 2:
+            if request.method == "PATCH":
+                return self._result({})
+            wlan_id = self.site.wlans[0]["id"] if self.site.wlans else ""
+            return self._result({"wlanId": wlan_id, "ssidOverrides": [
+                {"globalSsid": ssid["name"], "ssidEnable": True} for ssid in self.site.ssids.get(wlan_id, [])]})
+        if parts[0] == "devices" and len(parts) == 3 and parts[2] == "firmware":
+            return self._result({"curFwVer": "1.0.0", "lastFwVer": "1.0.0", "fwReleaseLog": ""})
+        if path == "/rfPlanning":
+            return self._result({"scheduleEnable": False})
+        if path == "/rfPlanning/result":
+            return self._result({"status": 0})
+        if path == "/setting/wlans":
+            return self._result({"data": self.site.wlans})
+        if parts[:2] == ["setting", "wlans"] and len(parts) == 4 and parts[3] == "ssids":
+            return self._result({"data": self.site.ssids.get(parts[2], [])})
+
+        raise web.HTTPNotFound()
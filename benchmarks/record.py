@@ -0,0 +1,76 @@
+"""Record the traffic of polling a real Omada controller to a cassette, for replaying with bench_poll.py --cassette.
+
+Usernames, passwords and tokens are scrubbed, everything else the controller returns is kept as is.
+
+    python benchmarks/record.py https://omada.example:8043 --site Default --username admin --polls 3 site.jsonl.gz
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import getpass
+import logging
+import os
+import sys
+
+import aiohttp
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from custom_components.omada.api.cassette import CassetteRecorder  # noqa: E402
+from custom_components.omada.api.controller import Controller  # noqa: E402
+
+
+async def async_record(args) -> CassetteRecorder:
+    recorder = CassetteRecorder()
+
+    async with aiohttp.ClientSession(cookie_jar=aiohttp.CookieJar(unsafe=True)) as session:
+        controller = Controller(args.url, args.username, args.password, session, site=args.site,
+                                ssl_context=None if args.verify_ssl else False, recorder=recorder)
+
+        # Fetch the details of every device on every poll so replays can serve them however they are cached.
+        controller.devices.details_ttl = 0
+
+        await controller.login()
+        await controller.update_status()
+        await controller.update_ssids()
+
+        for poll in range(args.polls):
+            if poll:
+                await asyncio.sleep(args.interval)
+
+            await controller.devices.update(update_details=True)
+            await controller.clients.update()
+            await controller.known_clients.update()
+
+            print(f"Poll {poll + 1}: {len(controller.devices)} devices, {len(controller.clients)} clients, "
+                  f"{len(controller.known_clients)} known clients")
+
+    return recorder
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("url")
+    parser.add_argument("cassette", help="file to write, gzipped JSON lines")
+    parser.add_argument("--site", default="Default")
+    parser.add_argument("--username", required=True)
+    parser.add_argument("--password", help="prompted for when omitted")
+    parser.add_argument("--no-verify-ssl", dest="verify_ssl", action="store_false")
+    parser.add_argument("--polls", type=int, default=3)
+    parser.add_argument("--interval", type=float, default=30.0, help="seconds between polls")
+    args = parser.parse_args()
+
+    if args.password is None:
+        args.password = getpass.getpass()
+
+    logging.basicConfig(level=logging.WARNING)
+
+    recorder = asyncio.run(async_record(args))
+    recorder.save(args.cassette)
+    print(f"Recorded {len(recorder.interactions)} requests to {args.cassette}")
+
+
+if __name__ == "__main__":
+    main()
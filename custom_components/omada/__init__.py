@@ -43,5 +43,9 @@ async def async_unload_entry(hass: HomeAssistant, entry: ConfigEntry):
     return await omada_controller.async_close()
 
 
+async def async_remove_entry(hass: HomeAssistant, entry: ConfigEntry):
+    await OmadaController.async_remove_session(hass, entry)
+
+
 async def update_listener(hass: HomeAssistant, entry: ConfigEntry):
     pass
@@ -1,30 +1,119 @@
+import asyncio
 import logging
+import time
 
 from typing import Any, Callable, Dict
 from abc import abstractmethod
+from dataclasses import dataclass, field
 
-from .errors import (OmadaApiException)
+from .errors import (OmadaApiException, LoginRequired)
 
 LOGGER = logging.getLogger(__name__)
 
+# Returned by requests made with skip_unchanged when the response is identical to the previous one.
+UNCHANGED = object()
+
+DEFAULT_DETAILS_CONCURRENCY = 8
+DEFAULT_PAGE_SIZE = 1000
+UNPAGED_PAGE_SIZE = 1000000
+# Walks over a collection that changed while paging through it, after which removals are skipped for the update.
+PAGINATED_WALK_ATTEMPTS = 2
+
+@dataclass
+class ChangeSet:
+    """Keys added, removed and modified by an update. Modified keys map to the raw fields that changed."""
+
+    added: set[str] = field(default_factory=set)
+    removed: set[str] = field(default_factory=set)
+    modified: Dict[str, set[str]] = field(default_factory=dict)
+
+    def __bool__(self) -> bool:
+        return bool(self.added or self.removed or self.modified)
+
+    @property
+    def keys(self) -> set[str]:
+        """Every key affected by the update."""
+        return self.added | self.removed | self.modified.keys()
+
+    def add_modified(self, key: str, fields: set[str]) -> None:
+        if key in self.added:
+            return
+        self.modified.setdefault(key, set()).update(fields)
+
+    def merge(self, other: "ChangeSet") -> None:
+        """Fold a later change set into this one."""
+        for key in other.added:
+            self.removed.discard(key)
+            self.added.add(key)
+        for key in other.removed:
+            self.modified.pop(key, None)
+            if key in self.added:
+                self.added.discard(key)
+            else:
+                self.removed.add(key)
+        for key, fields in other.modified.items():
+            self.add_modified(key, fields)
+
+
+def project_raw(raw: Dict[str, Any], fields: Dict[str, tuple[str, ...] | None]) -> Dict[str, Any]:
+    """Copy only the given fields of a raw item. Fields mapping to a tuple are dicts of which only those keys are kept."""
+
+    compact = {}
+
+    for key, sub_fields in fields.items():
+        if key in raw:
+            value = raw[key]
+            if sub_fields is not None and isinstance(value, dict):
+                value = {sub_key: value[sub_key] for sub_key in sub_fields if sub_key in value}
+            compact[key] = value
+
+    return compact
+
+
 class APIItem:
+
+    __slots__ = ("_raw", "_details")
+
+    # Raw fields read by the item's properties, kept when items are stored in compact form.
+    _fields: Dict[str, tuple[str, ...] | None] = {}
+
     def __init__(self, raw):
         self._raw: Dict[str, Any] = raw
         self._details: Dict[str, Any] = {}
 
-    def update(self, raw=None):
+    def update(self, raw=None) -> set[str]:
+        """Replace the raw data. Returns the names of the fields that changed."""
         if raw:
+            changed = {key for key in raw.keys() | self._raw.keys() if raw.get(key) != self._raw.get(key)}
             self._raw = raw
+            return changed
         else:
-            return
+            return set()
+
+    def field_values(self, fields: tuple[str, ...]) -> tuple:
+        """Raw values of the given fields, to tell whether any of them changed since."""
+        return tuple(map(self._raw.get, fields))
+
+    def set_details(self, details: Dict[str, Any], properties: list[str]) -> set[str]:
+        """Copy the requested properties into the details. Returns the names of the properties that changed."""
+        changed = set()
+        for prop in properties:
+            if prop in details and self._details.get(prop) != details[prop]:
+                self._details[prop] = details[prop]
+                changed.add(prop)
+        return changed
 
 
 class APIItems:
 
     _has_details = False
 
+    # Secondary indexes maintained on the items, mapping an item property to the raw field it's read from.
+    _indexes: Dict[str, str] = {}
+
     def __init__(self, request: Callable[[str, str, list[Dict[str, str]]], Any], end_point: str, key: str,
-                 item_cls: str, data_key: str = ""):
+                 item_cls: str, data_key: str = "", details_concurrency: int = DEFAULT_DETAILS_CONCURRENCY,
+                 page_size: int = 0, compact: bool = False):
         self._request: Callable[[
             str, str, list[Dict[str, str]]], Any] = request
         self._end_point: str = end_point
@@ -32,44 +121,205 @@ class APIItems:
         self._key: str = key
         self._item_cls = item_cls
         self._data_key: str = data_key
+        self.details_concurrency: int = details_concurrency
+        self.details_duration: float | None = None
+        # Paging is only supported by end points returning a dict with a data key. 0 requests everything at once.
+        self.page_size: int = page_size if data_key else 0
+        # Keys and total rows of each page processed, for pages that come back unchanged.
+        self._pages: Dict[int, tuple[list[str], int | None]] = {}
+        # Changes made to the items by an update that failed part way, reported by the next update.
+        self._pending_changes: ChangeSet | None = None
+        self.fingerprint_hits: int = 0
+        # Only keep the fields used by the item properties instead of the full raw item.
+        self.compact: bool = compact and bool(item_cls._fields)
+        self._index: Dict[str, Dict[Any, set[str]]] = {name: {} for name in self._indexes}
+        self._indexed_values: Dict[str, Dict[str, Any]] = {name: {} for name in self._indexes}
+
+    async def update(self, update_details: bool = False) -> ChangeSet:
+        """Update the collection. Returns what changed since the previous update."""
+
+        if self.page_size > 0:
+            changes = await self._update_paginated()
+        else:
+            response = await self._request_page(1, UNPAGED_PAGE_SIZE, skip_unchanged=bool(self.items))
+            if response is UNCHANGED:
+                self.fingerprint_hits += 1
+                changes = ChangeSet()
+            else:
+                changes = self._process_raw(self._parse_response(response))
+
+        if update_details and self._has_details:
+            await self._update_all_details(changes)
+
+        return changes
+
+    async def _update_paginated(self) -> ChangeSet:
+        """Walk the collection page by page, processing each page as it arrives."""
+
+        changes = self._take_pending_changes()
+
+        try:
+            for _ in range(PAGINATED_WALK_ATTEMPTS):
+                present_items = set()
+                if await self._walk_pages(present_items, changes):
+                    self._remove_absent(present_items, changes)
+                    break
+            else:
+                LOGGER.debug("%s kept changing while paging through it, not removing absent items", self._end_point)
+        except BaseException:
+            # Pages processed before the failure already changed the items. Their fingerprints would have the next
+            # update skip them, so forget the pages and report their changes with the next update instead.
+            self._pages.clear()
+            self._pending_changes = changes
+            raise
+
+        return changes
+
+    def _take_pending_changes(self) -> ChangeSet:
+        changes = self._pending_changes or ChangeSet()
+        self._pending_changes = None
+        return changes
+
+    async def _walk_pages(self, present_items: set[str], changes: ChangeSet) -> bool:
+        """Process every page. Returns False if the total row count changed between pages, as rows then shift between
+        pages and items that are still present may not have been on any page."""
+
+        consistent = True
+        first_total_rows = None
+        page = 1
+
+        while True:
+            response = await self._request_page(page, self.page_size, skip_unchanged=page in self._pages)
 
-    async def update(self, update_details: bool = False):
-        response = await self._request("GET", self._end_point, params=[
-            ("filters.active", "true"), ("currentPage",
-                                         "1"), ("currentPageSize", "1000000")
-        ])
+            known_count = len(present_items)
 
+            if response is UNCHANGED:
+                self.fingerprint_hits += 1
+                keys, total_rows = self._pages[page]
+                present_items.update(keys)
+            else:
+                raw = self._parse_response(response)
+                keys = self._process_page(raw, present_items, changes)
+                total_rows = response.get("totalRows")
+                self._pages[page] = (keys, total_rows)
+
+            if total_rows is not None:
+                if first_total_rows is None:
+                    first_total_rows = total_rows
+                elif total_rows != first_total_rows:
+                    consistent = False
+
+            if len(keys) < self.page_size or len(present_items) == known_count:
+                # Last page, or the controller ignored the page number and served us a page we have already seen.
+                break
+
+            if total_rows is not None and page * self.page_size >= total_rows:
+                break
+
+            page += 1
+
+        for stale_page in [p for p in self._pages if p > page]:
+            self._pages.pop(stale_page)
+
+        return consistent
+
+    async def _request_page(self, page: int, page_size: int, skip_unchanged: bool = False):
+        # Every page is fingerprinted, also when it can't be skipped, so later updates compare against what was applied.
+        return await self._request("GET", self._end_point, params=self._page_params(page, page_size),
+                                   skip_unchanged=skip_unchanged, fingerprint=True)
+
+    @staticmethod
+    def _page_params(page: int, page_size: int) -> list[tuple[str, str]]:
+        return [("filters.active", "true"), ("currentPage", str(page)), ("currentPageSize", str(page_size))]
+
+    def _parse_response(self, response) -> list[Dict[str, Any]]:
         if self._data_key == "":
             # Response is a list
-            self._process_raw(response)
+            return response
         elif self._data_key in response:
             # Response is a dict, process a specific key containing a list
-            self._process_raw(response[self._data_key])
+            return response[self._data_key]
         else:
             raise OmadaApiException(
-                f"Unable to parse {{self._end_point}}: '{self._data_key}' array not available in response.")
+                f"Unable to parse {self._end_point}: '{self._data_key}' array not available in response.")
 
-        if update_details and self._has_details:
-            for key, item in self.items.items():
-                await self.update_details(key, item)         
+    async def _update_all_details(self, changes: ChangeSet) -> None:
+        """Fetch details for every item, running at most details_concurrency requests at once."""
+
+        semaphore = asyncio.Semaphore(max(1, self.details_concurrency))
+
+        async def update_item_details(key: str, item: APIItem) -> None:
+            async with semaphore:
+                try:
+                    if changed := await self.update_details(key, item):
+                        changes.add_modified(key, changed)
+                except LoginRequired:
+                    raise
+                except OmadaApiException as err:
+                    # A single failing item shouldn't prevent the others from being updated.
+                    LOGGER.warning("Unable to update details for %s: %s", key, err)
+
+        start = time.monotonic()
+
+        tasks = [asyncio.ensure_future(update_item_details(key, item)) for key, item in list(self.items.items())]
+        try:
+            await asyncio.gather(*tasks)
+        except BaseException:
+            # Once the login expired the remaining requests would fail as well, and the update is retried after
+            # logging in again. Stop them rather than leaving them running against the returned change set.
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+            raise
+
+        self.details_duration = time.monotonic() - start
+        LOGGER.debug("Updated details of %d items from %s in %.3fs",
+                     len(self.items), self._end_point, self.details_duration)
 
     @abstractmethod
-    def update_details(self, key: str, item: APIItem) -> None:
+    async def update_details(self, key: str, item: APIItem) -> set[str]:
+        """Fetch additional details for an item. Returns the names of the details that changed."""
         pass
 
-    def _process_raw(self, raw):
+    def _process_raw(self, raw) -> ChangeSet:
+        changes = ChangeSet()
         present_items = set()
-        removed_items = set()
+
+        self._process_page(raw, present_items, changes)
+        self._remove_absent(present_items, changes)
+
+        return changes
+
+    def _process_page(self, raw, present_items: set[str], changes: ChangeSet) -> list[str]:
+        """Add or update the items of a single page, recording their keys in present_items. Returns the page's keys."""
+
+        keys = []
 
         for raw_item in raw:
             key = raw_item[self._key]
+            keys.append(key)
             present_items.add(key)
             existing = self.items.get(key)
 
+            if self.compact:
+                raw_item = project_raw(raw_item, self._item_cls._fields)
+
             if existing is not None:
-                existing.update(raw=raw_item)
+                if changed := existing.update(raw=raw_item):
+                    changes.add_modified(key, changed)
+                    self._reindex(key, existing, changed)
             else:
-                self.items[key] = self._item_cls(raw_item)
+                item = self._item_cls(raw_item)
+                self.items[key] = item
+                changes.added.add(key)
+                self._reindex(key, item)
+
+        return keys
+
+    def _remove_absent(self, present_items: set[str], changes: ChangeSet) -> None:
+        """Remove every item that wasn't present in the last update."""
+
+        removed_items = set()
 
         for key in self.items:
             if key not in present_items:
@@ -77,6 +327,47 @@ class APIItems:
 
         for key in removed_items:
             self.items.pop(key)
+            self._item_removed(key)
+
+        changes.removed.update(removed_items)
+
+    def _item_removed(self, key: str) -> None:
+        """Called after an item was removed from the collection."""
+        self._unindex(key)
+
+    def _reindex(self, key: str, item: APIItem, changed_fields: set[str] | None = None) -> None:
+        """Update the secondary indexes for an item. Only indexes on changed fields are updated if given."""
+
+        for name, field in self._indexes.items():
+            if changed_fields is not None and field not in changed_fields:
+                continue
+
+            value = getattr(item, name)
+            indexed_values = self._indexed_values[name]
+
+            if key in indexed_values:
+                previous = indexed_values[key]
+                if previous == value:
+                    continue
+                self._discard_from_index(name, previous, key)
+
+            self._index[name].setdefault(value, set()).add(key)
+            indexed_values[key] = value
+
+    def _unindex(self, key: str) -> None:
+        for name, indexed_values in self._indexed_values.items():
+            if key in indexed_values:
+                self._discard_from_index(name, indexed_values.pop(key), key)
+
+    def _discard_from_index(self, name: str, value: Any, key: str) -> None:
+        keys = self._index[name][value]
+        keys.discard(key)
+        if not keys:
+            del self._index[name][value]
+
+    def lookup(self, index: str, value: Any) -> frozenset[str]:
+        """Return the keys of the items whose indexed property equals value."""
+        return frozenset(self._index[index].get(value, ()))
 
     def __getitem__(self, obj_id):
         try:
@@ -84,5 +375,11 @@ class APIItems:
         except KeyError:
             LOGGER.error(f"Couldn't find key: {obj_id}")
 
+    def __contains__(self, obj_id):
+        return obj_id in self.items
+
+    def __len__(self):
+        return len(self.items)
+
     def __iter__(self):
         return self.items.__iter__()
@@ -0,0 +1,152 @@
+"""Recording of controller traffic to cassettes and replaying them without a controller."""
+
+import asyncio
+import gzip
+import json
+import logging
+
+from collections import deque
+from typing import Any, Dict
+
+from aiohttp import DummyCookieJar
+from yarl import URL
+
+LOGGER = logging.getLogger(__name__)
+
+CASSETTE_VERSION = 1
+
+SCRUBBED = "**SCRUBBED**"
+SCRUBBED_JSON_KEYS = {"username", "password", "token"}
+SCRUBBED_PARAMS = {"token"}
+
+
+def _scrub(value: Any) -> Any:
+    if isinstance(value, dict):
+        return {key: SCRUBBED if key in SCRUBBED_JSON_KEYS else _scrub(item) for key, item in value.items()}
+    if isinstance(value, list):
+        return [_scrub(item) for item in value]
+    return value
+
+
+def _request_key(method: str, url: str, params) -> tuple:
+    """Identify a request by its method, path and parameters, ignoring the controller's address and the token."""
+    return (method.upper(), URL(url).path,
+            tuple((str(key), str(value)) for key, value in (params or ()) if key not in SCRUBBED_PARAMS))
+
+
+class CassetteRecorder:
+    """Collects request and response pairs with credentials scrubbed. Pass to Controller to record its traffic."""
+
+    def __init__(self):
+        self.interactions: list[Dict[str, Any]] = []
+
+    def record(self, method: str, url: str, params, json_data, status: int, content_type: str, body: bytes,
+               latency: float) -> None:
+        method, path, params = _request_key(method, url, params)
+
+        if content_type == "application/json":
+            # Scrubbing tokens from the login response requires decoding it, that's fine as recording isn't a hot path.
+            body = json.dumps(_scrub(json.loads(body)), separators=(",", ":")).encode()
+
+        self.interactions.append({
+            "method": method,
+            "path": path,
+            "params": params,
+            "json": _scrub(json_data),
+            "status": status,
+            "content_type": content_type,
+            "body": body.decode(errors="replace"),
+            "latency": round(latency, 4),
+        })
+
+    def save(self, path: str) -> None:
+        """Write the cassette as gzipped JSON lines, the first line being a header."""
+        with gzip.open(path, "wt", encoding="utf-8") as file:
+            file.write(json.dumps({"version": CASSETTE_VERSION, "interactions": len(self.interactions)}) + "\n")
+            for interaction in self.interactions:
+                file.write(json.dumps(interaction, separators=(",", ":")) + "\n")
+
+    async def async_save(self, path: str) -> None:
+        await asyncio.get_running_loop().run_in_executor(None, self.save, path)
+
+
+def load_cassette(path: str) -> list[Dict[str, Any]]:
+    with gzip.open(path, "rt", encoding="utf-8") as file:
+        header = json.loads(file.readline())
+        if header.get("version") != CASSETTE_VERSION:
+            raise ValueError(f"Unsupported cassette version {header.get('version')}")
+        return [json.loads(line) for line in file]
+
+
+class ReplayResponse:
+
+    def __init__(self, interaction: Dict[str, Any]):
+        self.status: int = interaction["status"]
+        self.content_type: str = interaction["content_type"]
+        self._body: bytes = interaction["body"].encode()
+
+    async def read(self) -> bytes:
+        return self._body
+
+    async def json(self) -> Any:
+        return json.loads(self._body)
+
+    async def __aenter__(self) -> "ReplayResponse":
+        return self
+
+    async def __aexit__(self, *exc) -> None:
+        pass
+
+
+class ReplaySession:
+    """Stands in for the aiohttp session of a Controller, serving the responses of a cassette.
+
+    Identical requests are answered in the order they were recorded, repeating the last answer once they run out, so
+    a replay can poll more often than the recording did. With realtime set, the recorded latencies are reproduced."""
+
+    def __init__(self, interactions: list[Dict[str, Any]], realtime: bool = False):
+        self.realtime = realtime
+        self.cookie_jar = DummyCookieJar()
+        self.request_count: int = 0
+        self.unmatched: int = 0
+        self._responses: Dict[tuple, deque[Dict[str, Any]]] = {}
+
+        for interaction in interactions:
+            key = (interaction["method"], interaction["path"], tuple(tuple(param) for param in interaction["params"]))
+            self._responses.setdefault(key, deque()).append(interaction)
+
+    @classmethod
+    def from_file(cls, path: str, realtime: bool = False) -> "ReplaySession":
+        return cls(load_cassette(path), realtime)
+
+    def request(self, method: str, url: str, params=None, **kwargs) -> "_ReplayRequest":
+        self.request_count += 1
+        return _ReplayRequest(self, _request_key(method, url, params))
+
+    async def _respond(self, key: tuple) -> ReplayResponse:
+        responses = self._responses.get(key)
+
+        if not responses:
+            self.unmatched += 1
+            LOGGER.debug("No recorded response for %s", key)
+            return ReplayResponse({"status": 404, "content_type": "text/plain", "body": ""})
+
+        interaction = responses.popleft() if len(responses) > 1 else responses[0]
+
+        if self.realtime:
+            await asyncio.sleep(interaction["latency"])
+
+        return ReplayResponse(interaction)
+
+
+class _ReplayRequest:
+
+    def __init__(self, session: ReplaySession, key: tuple):
+        self._session = session
+        self._key = key
+
+    async def __aenter__(self) -> ReplayResponse:
+        return await self._session._respond(self._key)
+
+    async def __aexit__(self, *exc) -> None:
+        pass
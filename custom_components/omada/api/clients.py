@@ -1,4 +1,4 @@
-from .api import (APIItems, APIItem)
+from .api import (APIItems, APIItem, DEFAULT_PAGE_SIZE)
 
 END_POINT = "/clients"
 
@@ -22,13 +22,24 @@ RADIO = [
 
 
 class Clients(APIItems): 
-    def __init__(self, request):
-        super().__init__(request, END_POINT, "mac", Client, data_key="data")
+
+    def __init__(self, request, compact: bool = False):
+        super().__init__(request, END_POINT, "mac", Client, data_key="data", page_size=DEFAULT_PAGE_SIZE,
+                         compact=compact)
 
 
 class Client(APIItem):
     """Defines all the properties for a Client"""
 
+    __slots__ = ()
+
+    _fields = dict.fromkeys((
+        "mac", "name", "hostName", "deviceType", "ip", "connectType", "connectDevType", "wireless", "ssid",
+        "signalLevel", "signalRank", "wifiMode", "apName", "apMac", "radioId", "channel", "rxRate", "txRate",
+        "powerSave", "rssi", "activity", "trafficDown", "trafficUp", "uptime", "lastSeen", "authStatus", "guest",
+        "active", "manager", "downPacket", "upPacket"
+    ))
+
     @property
     def mac(self) -> str:
         return self._raw.get("mac", "")
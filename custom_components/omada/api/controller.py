@@ -1,21 +1,43 @@
+import asyncio
+import hashlib
 import logging
+import time
 import async_timeout
 
 from dataclasses import dataclass
+from typing import Any, Dict
 from asyncio.exceptions import TimeoutError
 
+try:
+    # Considerably faster than the standard library when available.
+    from orjson import loads as json_loads
+except ImportError:
+    from json import loads as json_loads
+
 from aiohttp import client_exceptions
 from aiohttp.client import ClientSession
+from yarl import URL
 
+from .api import UNCHANGED, DEFAULT_DETAILS_CONCURRENCY
+from .cassette import CassetteRecorder
 from .clients import Clients
 from .devices import Devices
 from .errors import (OmadaApiException, HttpErrorCode, InvalidURLError, SSLError, UnknownSite, raise_response_error, RequestError, RequestTimeout)
 from .known_clients import KnownClients
+from .metrics import RequestMetrics
 
 LOGGER = logging.getLogger(__name__)
 
 API_PATH = "/api/v2"
 
+# The controller doesn't report how long a token is valid. Tokens are renewed TOKEN_RENEWAL_MARGIN seconds before the
+# expected lifetime runs out.
+DEFAULT_TOKEN_LIFETIME = 3600
+TOKEN_RENEWAL_MARGIN = 300
+
+# Responses of at least this many bytes are decoded in an executor instead of on the event loop.
+EXECUTOR_DECODE_THRESHOLD = 256 * 1024
+
 
 @dataclass
 class RFPlanningState:
@@ -23,6 +45,30 @@ class RFPlanningState:
     schedule_enable: bool
 
 
+@dataclass
+class DecodeStats:
+    """Time spent decoding JSON responses."""
+
+    count: int = 0
+    executor_count: int = 0
+    bytes: int = 0
+    total_time: float = 0.0
+    max_time: float = 0.0
+
+    def record(self, size: int, elapsed: float, in_executor: bool) -> None:
+        self.count += 1
+        self.executor_count += in_executor
+        self.bytes += size
+        self.total_time += elapsed
+        self.max_time = max(self.max_time, elapsed)
+
+
+def _timed_json_loads(body: bytes) -> tuple[Any, float]:
+    start = time.perf_counter()
+    result = json_loads(body)
+    return result, time.perf_counter() - start
+
+
 class Controller:
     def __init__(
             self,
@@ -32,6 +78,9 @@ class Controller:
             websession: ClientSession,
             site: str = "Default",
             ssl_context=None,
+            compact_items: bool = False,
+            recorder: CassetteRecorder | None = None,
+            details_concurrency: int = DEFAULT_DETAILS_CONCURRENCY,
     ):
 
         self.url = url
@@ -45,29 +94,109 @@ class Controller:
         self._ssl_context = ssl_context
         self._site_id = None
         self._token = None
-        self.clients = Clients(self._site_request)
-        self.devices = Devices(self._site_request)
-        self.known_clients = KnownClients(self._site_request)
+        self.token_acquired: float | None = None
+        self.token_lifetime: float = DEFAULT_TOKEN_LIFETIME
+        self._login_task = None
+        self._fingerprints = {}
+        self.fingerprint_hits = 0
+        self._in_flight = {}
+        self.coalesced_requests = 0
+        self.decode_stats = DecodeStats()
+        self.metrics = RequestMetrics()
+        # Records every request and response when set, for replaying them later with a ReplaySession.
+        self.recorder = recorder
+        self.clients = Clients(self._site_request, compact=compact_items)
+        self.devices = Devices(self._site_request, compact=compact_items, details_concurrency=details_concurrency)
+        self.known_clients = KnownClients(self._site_request, compact=compact_items)
         self.ssids = set()
         self.rf_planning = None
 
     async def login(self) -> None:
-        """Call to obtain login token, controller id, and site id."""
+        """Call to obtain login token, controller id, and site id. Concurrent calls share a single login."""
+        await self._single_flight_login(self._login)
 
+    async def renew_token(self) -> None:
+        """Obtain a new login token without refreshing the API information."""
+        if not self.version:
+            await self.login()
+        else:
+            await self._single_flight_login(self._obtain_token)
+
+    def session_state(self) -> Dict[str, Any]:
+        """Login state that can be stored to resume the session later with restore_session()."""
+        return {
+            "url": self.url,
+            "username": self._username,
+            "site": self.site,
+            "version": self.version,
+            "controller_id": self.controller_id,
+            "site_id": self._site_id,
+            "token": self._token,
+            # Wall clock time the token was obtained, monotonic time doesn't survive restarts.
+            "token_issued": time.time() - (time.monotonic() - self.token_acquired) if self.token_acquired else None,
+            "cookies": {name: morsel.value for name, morsel in
+                        self._session.cookie_jar.filter_cookies(URL(self.url)).items()},
+            "ssids": sorted(self.ssids),
+        }
+
+    def restore_session(self, state: Dict[str, Any]) -> bool:
+        """Resume a session stored with session_state(). The token isn't verified, returns whether it could be used."""
+        if ((state.get("url"), state.get("username"), state.get("site")) != (self.url, self._username, self.site) or
+                not state.get("token")):
+            return False
+
+        self.version = state["version"]
+        self.controller_id = state["controller_id"]
+        self._site_id = state["site_id"]
+        self._token = state["token"]
+        self.token_acquired = None
+        if state.get("token_issued"):
+            self.token_acquired = time.monotonic() - max(0.0, time.time() - state["token_issued"])
+        self.ssids = set(state.get("ssids", []))
+
+        if cookies := state.get("cookies"):
+            self._session.cookie_jar.update_cookies(cookies, response_url=URL(self.url))
+
+        return True
+
+    @property
+    def token_expiring(self) -> bool:
+        """Whether the token is about to reach its expected lifetime."""
+        return (self.token_acquired is not None and
+                time.monotonic() - self.token_acquired >= self.token_lifetime - TOKEN_RENEWAL_MARGIN)
+
+    async def _single_flight_login(self, login) -> None:
+        if self._login_task is None:
+            self._login_task = asyncio.ensure_future(login())
+
+            def login_done(task):
+                self._login_task = None
+                if not task.cancelled():
+                    task.exception()
+
+            self._login_task.add_done_callback(login_done)
+
+        await asyncio.shield(self._login_task)
+
+    async def _login(self) -> None:
         # Update API information before doing anything. This also ensures we correctly recover from controller upgrades.
         await self._update_api_info()
 
+        await self._obtain_token()
+
+        # Acquire site id for site name as required for versions 5+
+        if self.version >= "5.0.0":
+            await self._update_site_id()
+
+    async def _obtain_token(self) -> None:
         auth = {"username": self._username, "password": self._password}
         response = await self._controller_request("post", "/login", json=auth)
 
         self._token = response["token"]
+        self.token_acquired = time.monotonic()
 
         LOGGER.info("Login successful.")
 
-        # Acquire site id for site name as required for versions 5+
-        if self.version >= "5.0.0":
-            await self._update_site_id()
-
     async def _update_api_info(self):
         """Obtain basic API information required to properly interact with different versions of the API."""
 
@@ -97,14 +226,20 @@ class Controller:
     async def update_status(self):
         """Update controller information."""
 
-        response = await self._controller_request(
-            "get", "/maintenance/controllerStatus", private=True
-)
+        response, _ = await asyncio.gather(
+            self._controller_request("get", "/maintenance/controllerStatus", private=True),
+            self._update_rf_planning()
+        )
         self.name = response["name"]
 
+    async def _update_rf_planning(self):
+        """Update the WLAN optimization state. Failures are not fatal as not every controller supports it."""
+
         try:
-            response = await self._site_request("get", "/rfPlanning")
-            status_response = await self._site_request("get", "/rfPlanning/result")
+            response, status_response = await asyncio.gather(
+                self._site_request("get", "/rfPlanning"),
+                self._site_request("get", "/rfPlanning/result")
+            )
 
             self.rf_planning = RFPlanningState(
                 status=status_response.get("status", None),
@@ -113,22 +248,20 @@ class Controller:
             self.rf_planning = None
             LOGGER.warn(f"Unable to get rfPlanning status: {err}")
 
-    async def update_ssids(self):
-        """Retrieve the list of avaiable SSIDs within a site."""
+    async def update_ssids(self) -> bool:
+        """Retrieve the list of avaiable SSIDs within a site. Returns whether the SSIDs changed."""
+
+        ssids = set()
 
         if self.version < "4.4.8":
             response = await self._site_request("get", "/setting/ssids")
 
-            self.ssids.clear()
-
             for ssid in response["ssids"][0]["ssidList"]:
-                self.ssids.add(ssid["ssidName"])
+                ssids.add(ssid["ssidName"])
 
         else:
             response = await self._site_request("get", "/setting/wlans")
 
-            self.ssids.clear()
-
             # The key of the id changed in v5
             wland_id_key = None
             if self.version >= "5.0.0":
@@ -136,14 +269,18 @@ class Controller:
             else:
                 wland_id_key = "wlanId"
 
-            for wlan in response["data"]:
-                wlan_id = wlan[wland_id_key]
-                ssid_response = await self._site_request(
-                    "get", f"/setting/wlans/{wlan_id}/ssids"
-                )
+            ssid_responses = await asyncio.gather(*(
+                self._site_request("get", f"/setting/wlans/{wlan[wland_id_key]}/ssids") for wlan in response["data"]
+            ))
 
+            for ssid_response in ssid_responses:
                 for ssid in ssid_response["data"]:
-                    self.ssids.add(ssid["name"])
+                    ssids.add(ssid["name"])
+
+        changed = ssids != self.ssids
+        self.ssids = ssids
+
+        return changed
 
     async def start_rf_planning(self):
         await self._site_request("POST", "/cmd/rfPlanning/optimization")
@@ -152,7 +289,7 @@ class Controller:
         await self._site_request("PUT", "/rfPlanning/schedule",
                                         json={"scheduleEnable": enabled})
 
-    async def _site_request(self, method, end_point, params=None, json=None):
+    async def _site_request(self, method, end_point, params=None, json=None, skip_unchanged=False, fingerprint=False):
         """Perform a request specific to a site."""
 
         endpoint = None
@@ -161,10 +298,11 @@ class Controller:
         else:
             endpoint = f"/sites/{self.site}{end_point}"
 
-        return await self._controller_request(method, endpoint, params=params, json=json, private=True)
+        return await self._controller_request(method, endpoint, params=params, json=json, private=True,
+                                              skip_unchanged=skip_unchanged, fingerprint=fingerprint)
 
     async def _controller_request(
-            self, method, end_point, params=None, json=None, private=False
+            self, method, end_point, params=None, json=None, private=False, skip_unchanged=False, fingerprint=False
     ):
         """Perform a request specific to the controlller"""
 
@@ -180,13 +318,66 @@ class Controller:
             url = f"{self.url}{API_PATH}{end_point}"
 
         return await self._request(
-            method, url, params=params, json=json, private=private
+            method, url, params=params, json=json, private=private, skip_unchanged=skip_unchanged,
+            fingerprint=fingerprint
         )
 
-    async def _request(self, method, url, params=None, json=None, private=False):
-        """Perform a request. Will automatically handle the login token if private is set to True."""
+    async def _request(self, method, url, params=None, json=None, private=False, skip_unchanged=False,
+                       fingerprint=False):
+        """Perform a request. Will automatically handle the login token if private is set to True.
+
+        If skip_unchanged is set, UNCHANGED is returned without decoding the response when its body is identical to
+        the previous response of the same request. The body of every response is remembered for that if either
+        skip_unchanged or fingerprint is set. Requests that may be skipped later should always set fingerprint, else a
+        response matching an older body would be skipped although the caller has since applied a different one.
+
+        Identical GET requests made while one is already in flight share its response, which must not be modified."""
+
+        if method.upper() != "GET":
+            return await self._send_request(method, url, params, json, private, skip_unchanged, fingerprint)
+
+        key = (url, tuple(params or ()), private, skip_unchanged, fingerprint)
+        task = self._in_flight.get(key)
+
+        if task is None:
+            task = asyncio.ensure_future(
+                self._send_request(method, url, params, json, private, skip_unchanged, fingerprint))
+            self._in_flight[key] = task
+
+            def request_done(_):
+                if self._in_flight.get(key) is task:
+                    del self._in_flight[key]
+                # Retrieve the exception in case every caller was cancelled while waiting.
+                if not task.cancelled():
+                    task.exception()
+
+            task.add_done_callback(request_done)
+        else:
+            self.coalesced_requests += 1
+            LOGGER.debug("Joining in-flight request: %s - Params: %s", url, params)
+
+        # Shielded so that a cancelled caller doesn't cancel the request for the others.
+        return await asyncio.shield(task)
+
+    async def _send_request(self, method, url, params, json, private, skip_unchanged, fingerprint=False):
+        start = time.monotonic()
+        try:
+            response, size = await self._http_request(method, url, params, json, private, skip_unchanged,
+                                                      fingerprint)
+        except OmadaApiException as err:
+            self.metrics.record(method, url, time.monotonic() - start, error=err)
+            raise
+
+        self.metrics.record(method, url, time.monotonic() - start, size)
+        return response
 
+    async def _http_request(self, method, url, params, json, private, skip_unchanged, fingerprint=False):
+        """Perform the HTTP request. Returns the response and the size of its body."""
         headers = {}
+        fingerprint_key = None
+
+        if skip_unchanged or fingerprint:
+            fingerprint_key = (method.upper(), url, tuple(params or ()))
 
         if private:
             if not self.version:
@@ -203,6 +394,8 @@ class Controller:
 
         LOGGER.debug("Requesting: %s - Params: %s - JSON: %s - Headers %s", url, params, json, headers)
 
+        request_start = time.monotonic()
+
         try:
             with async_timeout.timeout(30):
                 async with self._session.request(
@@ -215,6 +408,10 @@ class Controller:
                 ) as res:
                     LOGGER.debug("%s %s %s", res.status, res.content_type, res)
 
+                    if self.recorder is not None:
+                        self.recorder.record(method, url, params, json, res.status, res.content_type,
+                                             await res.read(), time.monotonic() - request_start)
+
                     if res.status != 200:
                         if res.content_type == "application/json":
                             response = await res.json()
@@ -226,12 +423,25 @@ class Controller:
                         raise HttpErrorCode(url=url, code=res.status)
 
                     if res.content_type == "application/json":
-                        response = await res.json()
+                        body = await res.read()
+
+                        body_fingerprint = None
+                        if fingerprint_key is not None:
+                            body_fingerprint = hashlib.blake2b(body, digest_size=16).digest()
+                            if skip_unchanged and self._fingerprints.get(fingerprint_key) == body_fingerprint:
+                                self.fingerprint_hits += 1
+                                return UNCHANGED, len(body)
+
+                        response = await self._decode(body)
 
                         self._raiseOnResponseError(url, response)
+
+                        if body_fingerprint is not None:
+                            self._fingerprints[fingerprint_key] = body_fingerprint
+
                         if "result" in response:
-                            return response["result"]
-                        return response
+                            return response["result"], len(body)
+                        return response, len(body)
                     else:
                         raise RequestError(url, "Received non-json response!")
         except TimeoutError:
@@ -243,6 +453,19 @@ class Controller:
         except client_exceptions.ClientError as err:
             raise RequestError(url, err) from None
 
+    async def _decode(self, body: bytes) -> Any:
+        """Decode a JSON response, keeping large ones from blocking the event loop."""
+
+        in_executor = len(body) >= EXECUTOR_DECODE_THRESHOLD
+        if in_executor:
+            response, elapsed = await asyncio.get_running_loop().run_in_executor(None, _timed_json_loads, body)
+        else:
+            response, elapsed = _timed_json_loads(body)
+
+        self.decode_stats.record(len(body), elapsed, in_executor)
+
+        return response
+
     def _raiseOnResponseError(self, url, response):
         if not isinstance(response, dict):
             return
@@ -1,8 +1,9 @@
 import logging
+import time
 
 from typing import Any, Dict
 
-from .api import (APIItems, APIItem)
+from .api import (APIItems, APIItem, DEFAULT_DETAILS_CONCURRENCY)
 
 END_POINT = "/devices"
 AP_DETAILS_END_POINT = "/eaps/%key"
@@ -11,12 +12,36 @@ FIRMWARE_END_POINT = "/devices/%key/firmware"
 AP_DETAILS_PROPERTIES = ["ssidOverrides", "wlanId"]
 FIRMWARE_PROPERTIES = ["lastFwVer", "fwReleaseLog"]
 
+# Details are fetched again once they are older than this many seconds, or when one of the watched device fields change.
+DEFAULT_DETAILS_TTL = 600
+DETAILS_WATCHED_FIELDS = ("firmwareVersion", "needUpgrade", "status")
+
 LOGGER = logging.getLogger(__name__)
 
 
+RADIO_FIELDS = ("rdMode", "bandWidth", "txPower", "txUtil", "rxUtil", "interUtil")
+
+
 class Device(APIItem):
     """Defines all the properties for a Device"""
 
+    __slots__ = ()
+
+    _fields = {
+        **dict.fromkeys((
+            "type", "mac", "name", "compoundModel", "firmwareVersion", "needUpgrade", "status", "statusCategory",
+            "uptimeLong", "cpuUtil", "memUtil", "wirelessLinked", "uplink", "ip", "clientNum", "clientNum2g",
+            "clientNum5g", "clientNum6g", "guestNum", "userNum", "upload", "download", "txRate", "rxRate"
+        )),
+        "deviceMisc": ("support5g", "support6g"),
+        "radioSetting2g": ("radioEnable",),
+        "radioSetting5g": ("radioEnable",),
+        "radioSetting6g": ("radioEnable",),
+        "wp2g": RADIO_FIELDS,
+        "wp5g": RADIO_FIELDS,
+        "wp6g": RADIO_FIELDS,
+    }
+
     @property
     def type(self) -> str:
         return self._raw.get("type", "")
@@ -236,9 +261,30 @@ class Device(APIItem):
 class Devices(APIItems):
 
     _has_details = True
+    _indexes = {"status": "status"}
+
+    def __init__(self, request, compact: bool = False, details_concurrency: int = DEFAULT_DETAILS_CONCURRENCY):
+        super().__init__(request, END_POINT, "mac", Device, details_concurrency=details_concurrency, compact=compact)
+        self.details_ttl: float = DEFAULT_DETAILS_TTL
+        self.details_cache_hits: int = 0
+        # Time details were fetched and the watched fields at that time, by mac.
+        self._details_cache: Dict[str, tuple[float, tuple]] = {}
+
+    def invalidate_details(self, mac: str) -> None:
+        """Fetch the details of a device on the next details update, e.g. after changing its settings."""
+        self._details_cache.pop(mac, None)
 
-    def __init__(self, request):
-        super().__init__(request, END_POINT, "mac", Device)
+    def invalidate_all_details(self) -> None:
+        """Fetch the details of every device on the next details update, e.g. after the site's SSIDs changed."""
+        self._details_cache.clear()
+
+    def _item_removed(self, key: str) -> None:
+        super()._item_removed(key)
+        self.invalidate_details(key)
+
+    def by_status(self, status: int) -> frozenset[str]:
+        """Macs of the devices with a status, e.g. upgrading."""
+        return self.lookup("status", status)
 
     async def async_set_radio_enable(self, mac: str, radio: int, enable: bool) -> None:
 
@@ -258,6 +304,7 @@ class Devices(APIItems):
         }
 
         await self._request("PATCH", f"/eaps/{mac}", json=data)
+        self.invalidate_details(mac)
 
     async def async_set_ssid_enable(self, mac: str, existing_overrides: list[Dict[str, Any]], wlan_id: str, ssid: str, enabled: bool) -> None:
 
@@ -267,20 +314,29 @@ class Devices(APIItems):
                 break
 
         await self._request("PATCH", f"/eaps/{mac}", json={"wlanId": wlan_id, "ssidOverrides": existing_overrides})
+        self.invalidate_details(mac)
 
     async def trigger_update(self, mac: str) -> None:
         await self._request("POST", f"/cmd/devices/{mac}/onlineUpgrade", json={"mac": mac})
 
-    async def update_details(self, key: str, item: Device) -> None:
+    async def update_details(self, key: str, item: Device) -> set[str]:
+
+        watched = tuple(item._raw.get(field) for field in DETAILS_WATCHED_FIELDS)
+        cached = self._details_cache.get(key)
+        if cached is not None and cached[1] == watched and time.monotonic() - cached[0] < self.details_ttl:
+            self.details_cache_hits += 1
+            return set()
+
+        changed = set()
 
         if item.type == "ap":
             ap_details = await self._request("GET", AP_DETAILS_END_POINT.replace("%key", key))
-            for prop in AP_DETAILS_PROPERTIES:
-                if prop in ap_details:
-                    item._details[prop] = ap_details[prop]
+            changed |= item.set_details(ap_details, AP_DETAILS_PROPERTIES)
 
         if item.firmware_upgrade:
             firmware_details = await self._request("GET", FIRMWARE_END_POINT.replace("%key", key))
-            for prop in FIRMWARE_PROPERTIES:
-                if prop in firmware_details:
-                    item._details[prop] = firmware_details[prop]
+            changed |= item.set_details(firmware_details, FIRMWARE_PROPERTIES)
+
+        self._details_cache[key] = (time.monotonic(), watched)
+
+        return changed
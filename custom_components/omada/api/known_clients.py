@@ -1,16 +1,112 @@
-from .api import (APIItems, APIItem)
+import logging
+import time
+
+from .api import (APIItems, APIItem, ChangeSet, DEFAULT_PAGE_SIZE)
+
+LOGGER = logging.getLogger(__name__)
 
 END_POINT = "/insight/clients"
 
+# Incremental updates only fetch clients seen since the previous update. The whole history is downloaded again every
+# DEFAULT_FULL_SYNC_INTERVAL seconds to pick up deleted clients.
+DEFAULT_FULL_SYNC_INTERVAL = 3600
+INCREMENTAL_PAGE_SIZE = 100
+
 
 class KnownClients(APIItems):
-    def __init__(self, request):
-        super().__init__(request, END_POINT, "mac", KnownClient, data_key="data")
+    def __init__(self, request, compact: bool = False):
+        super().__init__(request, END_POINT, "mac", KnownClient, data_key="data", page_size=DEFAULT_PAGE_SIZE,
+                         compact=compact)
+        self.incremental: bool = True
+        self.full_sync_interval: float = DEFAULT_FULL_SYNC_INTERVAL
+        # Highest lastSeen of the known clients and the time the whole history was last downloaded.
+        self.last_seen_watermark: int | None = None
+        self._last_full_sync: float | None = None
+
+    async def update(self, update_details: bool = False) -> ChangeSet:
+        if (not self.incremental or self.last_seen_watermark is None or
+                time.monotonic() - self._last_full_sync >= self.full_sync_interval):
+            return await self._update_full(update_details)
+
+        changes = self._take_pending_changes()
+
+        try:
+            sorted_by_last_seen = await self._update_incremental(changes)
+        except BaseException:
+            # Pages processed before the failure already changed the items, report that with the next update.
+            self._pending_changes = changes
+            raise
+
+        if not sorted_by_last_seen:
+            LOGGER.debug("Controller doesn't sort %s by lastSeen, disabling incremental updates", self._end_point)
+            self.incremental = False
+            # Pages processed before the out of order page already changed the items, so the full update won't
+            # report those changes itself.
+            self._pending_changes = changes
+            return await self._update_full(update_details)
+
+        return changes
+
+    async def _update_full(self, update_details: bool) -> ChangeSet:
+        changes = await super().update(update_details)
+        self._last_full_sync = time.monotonic()
+        self.last_seen_watermark = max((item.last_seen for item in self.items.values()), default=0)
+        return changes
+
+    async def _update_incremental(self, changes: ChangeSet) -> bool:
+        """Fetch the clients seen since the watermark, newest first. Returns False if the controller ignores sorting."""
+
+        present_items = set()
+        watermark = self.last_seen_watermark
+        previous_last_seen = None
+        page = 1
+
+        while True:
+            # Same filters as full updates, so both see the same clients.
+            response = await self._request("GET", self._end_point, params=[
+                *self._page_params(page, INCREMENTAL_PAGE_SIZE), ("sorts.lastSeen", "desc")
+            ])
+            raw = self._parse_response(response)
+
+            seen = []
+            reached_watermark = False
+            for raw_item in raw:
+                # The whole page is checked since a controller ignoring the sort could start with an old client.
+                last_seen = raw_item.get("lastSeen", 0)
+                if previous_last_seen is not None and last_seen > previous_last_seen:
+                    return False
+                previous_last_seen = last_seen
+
+                # Clients seen exactly at the watermark are fetched again in case more of them arrived since.
+                if last_seen < watermark:
+                    reached_watermark = True
+                elif not reached_watermark:
+                    seen.append(raw_item)
+
+            self._process_page(seen, present_items, changes)
+
+            total_rows = response.get("totalRows")
+            if (reached_watermark or len(raw) < INCREMENTAL_PAGE_SIZE or
+                    (total_rows is not None and page * INCREMENTAL_PAGE_SIZE >= total_rows)):
+                break
+
+            page += 1
+
+        self.last_seen_watermark = max((self.items[key].last_seen for key in present_items), default=watermark)
+
+        return True
 
     async def async_set_block(self, mac: str, block: bool) -> None:
         await self._request("POST", "/cmd/clients/{}/{}".format(mac, block and "block" or "unblock"))
 
 class KnownClient(APIItem):
+
+    __slots__ = ()
+
+    _fields = dict.fromkeys((
+        "mac", "name", "wireless", "guest", "download", "upload", "duration", "lastSeen", "block", "manager"
+    ))
+
     @property
     def mac(self) -> str:
         return self._raw.get("mac", "")
@@ -0,0 +1,96 @@
+import re
+from bisect import bisect_left
+from dataclasses import dataclass, field
+from typing import Any, Dict
+
+from yarl import URL
+
+# Upper bounds in seconds of the request latency histogram buckets. Slower requests land in a final overflow bucket.
+LATENCY_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+# Path segments that identify a specific device, client or object are replaced so that requests to the same end point
+# are counted together.
+MAC_PATTERN = re.compile(r"(?<![0-9A-Fa-f])(?:[0-9A-Fa-f]{2}[-:]){5}[0-9A-Fa-f]{2}(?![0-9A-Fa-f])")
+ID_PATTERN = re.compile(r"(?<=/)[0-9a-fA-F]{24,}(?=/|$)")
+
+
+def end_point_template(method: str, url: str) -> str:
+    """Return the method and path of a request with macs and ids replaced by placeholders."""
+    path = MAC_PATTERN.sub("{mac}", URL(url).path)
+    return f"{method.upper()} {ID_PATTERN.sub('{id}', path)}"
+
+
+@dataclass
+class EndPointMetrics:
+    """Requests made to a single end point template."""
+
+    count: int = 0
+    errors: Dict[str, int] = field(default_factory=dict)
+    latency_buckets: list[int] = field(default_factory=lambda: [0] * (len(LATENCY_BUCKETS) + 1))
+    total_latency: float = 0.0
+    max_latency: float = 0.0
+    bytes: int = 0
+
+    @property
+    def error_count(self) -> int:
+        return sum(self.errors.values())
+
+    @property
+    def average_latency(self) -> float | None:
+        return self.total_latency / self.count if self.count else None
+
+    def as_dict(self) -> Dict[str, Any]:
+        return {
+            "count": self.count,
+            "errors": dict(self.errors),
+            "latency_histogram": {
+                **{f"<={bound}": count for bound, count in zip(LATENCY_BUCKETS, self.latency_buckets)},
+                f">{LATENCY_BUCKETS[-1]}": self.latency_buckets[-1],
+            },
+            "average_latency": self.average_latency,
+            "max_latency": self.max_latency,
+            "bytes": self.bytes,
+        }
+
+
+class RequestMetrics:
+    """Request counts, errors, latencies and response sizes per end point template."""
+
+    def __init__(self):
+        self.end_points: Dict[str, EndPointMetrics] = {}
+
+    def record(self, method: str, url: str, latency: float, size: int = 0, error: Exception | None = None) -> None:
+        metrics = self.end_points.setdefault(end_point_template(method, url), EndPointMetrics())
+
+        metrics.count += 1
+        metrics.total_latency += latency
+        metrics.max_latency = max(metrics.max_latency, latency)
+        metrics.bytes += size
+
+        metrics.latency_buckets[bisect_left(LATENCY_BUCKETS, latency)] += 1
+
+        if error is not None:
+            error_type = type(error).__name__
+            metrics.errors[error_type] = metrics.errors.get(error_type, 0) + 1
+
+    @property
+    def count(self) -> int:
+        return sum(metrics.count for metrics in self.end_points.values())
+
+    @property
+    def error_count(self) -> int:
+        return sum(metrics.error_count for metrics in self.end_points.values())
+
+    @property
+    def bytes(self) -> int:
+        return sum(metrics.bytes for metrics in self.end_points.values())
+
+    @property
+    def average_latency(self) -> float | None:
+        count = self.count
+        if not count:
+            return None
+        return sum(metrics.total_latency for metrics in self.end_points.values()) / count
+
+    def as_dict(self) -> Dict[str, Any]:
+        return {end_point: metrics.as_dict() for end_point, metrics in sorted(self.end_points.items())}
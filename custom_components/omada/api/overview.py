@@ -5,6 +5,8 @@ END_POINT = "/overviewDiagram"
 
 class OverviewDiagram(APIItem):
 
+    __slots__ = ()
+
     # WAN
     @property
     def wan_capacity(self):
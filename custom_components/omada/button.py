@@ -87,3 +87,4 @@ class OmadaControllerButtonEntity(OmadaControllerEntity, ButtonEntity):
 
     async def async_press(self) -> None:
         await self.entity_description.activate_fn(self.controller.api)
+        self.controller.async_notify_activity()
@@ -29,8 +29,20 @@ from .const import (
     CONF_ENABLE_DEVICE_CONTROLS,
     CONF_ENABLE_DEVICE_STATISTICS_SENSORS,
     CONF_ENABLE_DEVICE_CLIENTS_SENSORS,
+    CONF_STATUS_SCAN_INTERVAL,
+    CONF_DEVICES_SCAN_INTERVAL,
+    CONF_DETAILS_SCAN_INTERVAL,
+    CONF_CLIENTS_SCAN_INTERVAL,
+    CONF_KNOWN_CLIENTS_SCAN_INTERVAL,
+    CONF_SSIDS_SCAN_INTERVAL,
+    CONF_ADAPTIVE_POLLING,
+    CONF_ADAPTIVE_POLLING_MAX_INTERVAL,
+    CONF_POLL_OVERLAP_POLICY,
+    POLL_OVERLAP_SKIP,
+    POLL_OVERLAP_QUEUE,
+    POLL_OVERLAP_CANCEL,
 )
-from .controller import OmadaController, get_api_controller
+from .controller import OmadaController, get_api_controller, MIN_SCAN_INTERVAL
 
 
 class OmadaFlowHandler(config_entries.ConfigFlow, domain=OMADA_DOMAIN):
@@ -139,7 +151,7 @@ class OmadaOptionsFlowHandler(config_entries.OptionsFlow):
             elif self.options[CONF_TRACK_DEVICES]:
                 return await self.async_step_device_options()
             else:
-                return await self._update_options()
+                return await self.async_step_polling()
 
         return self.async_show_form(
             step_id="device_tracker",
@@ -162,7 +174,7 @@ class OmadaOptionsFlowHandler(config_entries.OptionsFlow):
             if self.options[CONF_TRACK_DEVICES]:
                 return await self.async_step_device_options()
             else:
-                return await self._update_options()
+                return await self.async_step_polling()
 
         ssid_filter = {ssid: ssid for ssid in sorted(self.controller.api.ssids)}
 
@@ -201,7 +213,7 @@ class OmadaOptionsFlowHandler(config_entries.OptionsFlow):
     async def async_step_device_options(self, user_input=None):
         if user_input is not None:
             self.options.update(user_input)
-            return await self._update_options()
+            return await self.async_step_polling()
 
         return self.async_show_form(
             step_id="device_options",
@@ -229,6 +241,66 @@ class OmadaOptionsFlowHandler(config_entries.OptionsFlow):
                     ): bool,
                 }
             ),
+            last_step=False,
+        )
+
+    async def async_step_polling(self, user_input=None):
+        if user_input is not None:
+            self.options.update(user_input)
+            return await self._update_options()
+
+        scan_interval = vol.All(cv.positive_int, vol.Range(min=MIN_SCAN_INTERVAL))
+        schema = {
+            vol.Optional(
+                CONF_STATUS_SCAN_INTERVAL,
+                default=self.controller.option_status_scan_interval,
+            ): scan_interval,
+            vol.Optional(
+                CONF_SSIDS_SCAN_INTERVAL,
+                default=self.controller.option_ssids_scan_interval,
+            ): scan_interval,
+        }
+
+        if self.options[CONF_TRACK_CLIENTS]:
+            schema[vol.Optional(
+                CONF_CLIENTS_SCAN_INTERVAL,
+                default=self.controller.option_clients_scan_interval,
+            )] = scan_interval
+            schema[vol.Optional(
+                CONF_KNOWN_CLIENTS_SCAN_INTERVAL,
+                default=self.controller.option_known_clients_scan_interval,
+            )] = scan_interval
+
+        if self.options[CONF_TRACK_DEVICES]:
+            schema[vol.Optional(
+                CONF_DEVICES_SCAN_INTERVAL,
+                default=self.controller.option_devices_scan_interval,
+            )] = scan_interval
+            schema[vol.Optional(
+                CONF_DETAILS_SCAN_INTERVAL,
+                default=self.controller.option_details_scan_interval,
+            )] = scan_interval
+
+        schema[vol.Optional(
+            CONF_ADAPTIVE_POLLING,
+            default=self.controller.option_adaptive_polling,
+        )] = bool
+        schema[vol.Optional(
+            CONF_ADAPTIVE_POLLING_MAX_INTERVAL,
+            default=self.controller.option_adaptive_polling_max_interval,
+        )] = scan_interval
+        schema[vol.Optional(
+            CONF_POLL_OVERLAP_POLICY,
+            default=self.controller.option_poll_overlap_policy,
+        )] = vol.In({
+            POLL_OVERLAP_SKIP: "Skip the next poll",
+            POLL_OVERLAP_QUEUE: "Poll again once it finishes",
+            POLL_OVERLAP_CANCEL: "Cancel it and start over once stuck, skip the next poll until then",
+        })
+
+        return self.async_show_form(
+            step_id="polling",
+            data_schema=vol.Schema(schema),
             last_step=True,
         )
 
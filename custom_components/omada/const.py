@@ -13,6 +13,24 @@ CONF_ENABLE_DEVICE_RADIO_UTILIZATION_SENSORS = "enable_device_radio_utilization_
 CONF_ENABLE_DEVICE_CONTROLS = "enable_device_controls"
 CONF_ENABLE_DEVICE_STATISTICS_SENSORS = "enable_device_statistics_sensors"
 CONF_ENABLE_DEVICE_CLIENTS_SENSORS = "enable_device_clients_sensors"
+CONF_STATUS_SCAN_INTERVAL = "status_scan_interval"
+CONF_DEVICES_SCAN_INTERVAL = "devices_scan_interval"
+CONF_DETAILS_SCAN_INTERVAL = "details_scan_interval"
+CONF_CLIENTS_SCAN_INTERVAL = "clients_scan_interval"
+CONF_KNOWN_CLIENTS_SCAN_INTERVAL = "known_clients_scan_interval"
+CONF_SSIDS_SCAN_INTERVAL = "ssids_scan_interval"
+CONF_ADAPTIVE_POLLING = "adaptive_polling"
+CONF_ADAPTIVE_POLLING_MAX_INTERVAL = "adaptive_polling_max_interval"
+CONF_POLL_OVERLAP_POLICY = "poll_overlap_policy"
 ATTR_MANUFACTURER = "TP-Link"
 ATTR_CONTROLLER_MODEL = "Omada Controller"
 CLIENTS = "clients"
+DEVICES = "devices"
+KNOWN_CLIENTS = "known_clients"
+STATUS = "status"
+DETAILS = "details"
+SSIDS = "ssids"
+METRICS = "metrics"
+POLL_OVERLAP_SKIP = "skip"
+POLL_OVERLAP_QUEUE = "queue"
+POLL_OVERLAP_CANCEL = "cancel"
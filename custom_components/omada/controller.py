@@ -1,7 +1,12 @@
+import asyncio
 import logging
 import ssl
+import time
 
 from aiohttp import CookieJar
+from collections import deque
+from collections.abc import Awaitable, Callable
+from dataclasses import dataclass, field
 from datetime import datetime, timedelta
 from typing import Dict
 
@@ -17,8 +22,10 @@ from homeassistant.helpers.dispatcher import async_dispatcher_send
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
 from homeassistant.helpers.entity_registry import async_entries_for_config_entry
 from homeassistant.helpers.event import async_track_time_interval
+from homeassistant.helpers.storage import Store
 from homeassistant.util import dt as dt_util
 
+from .api.api import APIItems, ChangeSet
 from .api.controller import Controller
 from .api.errors import (LoginFailed, OmadaApiException,
                          OperationForbidden, RequestError, LoginRequired, UnknownSite)
@@ -27,23 +34,95 @@ from .const import (CONF_SITE, CONF_SSID_FILTER, CONF_DISCONNECT_TIMEOUT, CONF_T
                     CONF_ENABLE_CLIENT_UPTIME_SENSORS, CONF_ENABLE_CLIENT_BLOCK_SWITCH,
                     CONF_ENABLE_DEVICE_BANDWIDTH_SENSORS, CONF_ENABLE_DEVICE_RADIO_UTILIZATION_SENSORS,
                     CONF_ENABLE_DEVICE_CONTROLS, CONF_ENABLE_DEVICE_STATISTICS_SENSORS,
-                    CONF_ENABLE_DEVICE_CLIENTS_SENSORS, DOMAIN as OMADA_DOMAIN)
+                    CONF_ENABLE_DEVICE_CLIENTS_SENSORS, CONF_STATUS_SCAN_INTERVAL, CONF_DEVICES_SCAN_INTERVAL,
+                    CONF_DETAILS_SCAN_INTERVAL, CONF_CLIENTS_SCAN_INTERVAL, CONF_KNOWN_CLIENTS_SCAN_INTERVAL,
+                    CONF_SSIDS_SCAN_INTERVAL, CONF_ADAPTIVE_POLLING, CONF_ADAPTIVE_POLLING_MAX_INTERVAL,
+                    CONF_POLL_OVERLAP_POLICY, DOMAIN as OMADA_DOMAIN, CLIENTS, DETAILS, DEVICES, KNOWN_CLIENTS,
+                    METRICS, SSIDS, STATUS, POLL_OVERLAP_SKIP, POLL_OVERLAP_QUEUE, POLL_OVERLAP_CANCEL)
 from .omada_entity import OmadaEntity, OmadaEntityDescription
 
-SCAN_INTERVAL = timedelta(seconds=30)
-DETAILS_SCAN_INTERVAL = timedelta(seconds=120)
+# Scan intervals in seconds
+DEFAULT_STATUS_SCAN_INTERVAL = 120
+DEFAULT_DEVICES_SCAN_INTERVAL = 30
+DEFAULT_DETAILS_SCAN_INTERVAL = 120
+DEFAULT_CLIENTS_SCAN_INTERVAL = 30
+DEFAULT_KNOWN_CLIENTS_SCAN_INTERVAL = 120
+DEFAULT_SSIDS_SCAN_INTERVAL = 600
+MIN_SCAN_INTERVAL = 5
+DEFAULT_ADAPTIVE_POLLING_MAX_INTERVAL = 300
+
+# Scan intervals are stretched by this factor after every poll that found no activity
+ADAPTIVE_POLLING_BACKOFF = 1.5
+
+# A poll running for longer than this many seconds is reported as stuck
+POLL_STUCK_AFTER = 300
+
+DEVICE_STATUS_UPGRADING = 12
+
+# The login session is stored so restarts can skip logging in
+STORAGE_VERSION = 1
+SESSION_SAVE_DELAY = 10
+
+# Number of polls whose timings are kept for diagnostics
+POLL_TIMINGS_KEPT = 20
 
 LOGGER = logging.getLogger(__name__)
 
 
+@dataclass
+class PollTiming:
+    """Where the time of a single poll went, in seconds."""
+
+    started: datetime
+    collections: Dict[str, float] = field(default_factory=dict)
+    details: float | None = None
+    dispatch: float = 0.0
+    total: float = 0.0
+    # Entity state writes caused by the poll. These happen after the poll finished dispatching its changes.
+    entity_writes: int = 0
+    entity_write_time: float = 0.0
+
+
+@dataclass
+class PollStats:
+    """Timer ticks that found the previous poll still running, and polls that took longer than the poll interval."""
+
+    ticks: int = 0
+    overlaps: int = 0
+    skipped: int = 0
+    queued: int = 0
+    cancelled: int = 0
+    overruns: int = 0
+    stuck: int = 0
+    longest: float = 0.0
+
+    @property
+    def missed(self) -> int:
+        return self.skipped + self.cancelled
+
+
 class OmadaController:
     def __init__(self, hass, config_entry):
         self.hass = hass
         self._config_entry = config_entry
         self.api: Controller = None
         self.entities = {}
+        self.changes: Dict[str, ChangeSet] = {}
+        self._options_generation = 0
+        self._registered_generation: Dict[tuple[str, str], int] = {}
         self._on_close = []
-        self._last_full_update: datetime = None
+        self._cancel_polling: CALLBACK_TYPE | None = None
+        self._poll_task: asyncio.Task | None = None
+        self._poll_started: float = 0.0
+        self._poll_queued = False
+        self._poll_reported_stuck = False
+        self._polling: set[str] = set()
+        self.poll_stats = PollStats()
+        self._last_polled: Dict[str, datetime] = {}
+        self._poll_backoff: float = 1.0
+        self.poll_timings: deque[PollTiming] = deque(maxlen=POLL_TIMINGS_KEPT)
+        self._store = Store(hass, STORAGE_VERSION, f"{OMADA_DOMAIN}.{config_entry.entry_id}", private=True)
+        self._saved_token_acquired: float | None = None
         self.option_track_clients = True
         self.option_track_devices = True
         self.option_ssid_filter = None
@@ -56,12 +135,22 @@ class OmadaController:
         self.option_device_clients_sensors = False
         self.option_device_radio_utilization_sensors = False
         self.option_device_controls = False
+        self.option_status_scan_interval = DEFAULT_STATUS_SCAN_INTERVAL
+        self.option_devices_scan_interval = DEFAULT_DEVICES_SCAN_INTERVAL
+        self.option_details_scan_interval = DEFAULT_DETAILS_SCAN_INTERVAL
+        self.option_clients_scan_interval = DEFAULT_CLIENTS_SCAN_INTERVAL
+        self.option_known_clients_scan_interval = DEFAULT_KNOWN_CLIENTS_SCAN_INTERVAL
+        self.option_ssids_scan_interval = DEFAULT_SSIDS_SCAN_INTERVAL
+        self.option_adaptive_polling = False
+        self.option_adaptive_polling_max_interval = DEFAULT_ADAPTIVE_POLLING_MAX_INTERVAL
+        self.option_poll_overlap_policy = POLL_OVERLAP_SKIP
         self.available = True
 
         self.load_config_entry_options()
 
     def load_config_entry_options(self):
         options = self._config_entry.options
+        self._options_generation += 1
 
         self.option_ssid_filter = set(options.get(CONF_SSID_FILTER, []))
         self.option_disconnect_timeout = options.get(CONF_DISCONNECT_TIMEOUT, 0)
@@ -75,6 +164,18 @@ class OmadaController:
         self.option_device_clients_sensors = options.get(CONF_ENABLE_DEVICE_CLIENTS_SENSORS, False)
         self.option_device_radio_utilization_sensors = options.get(CONF_ENABLE_DEVICE_RADIO_UTILIZATION_SENSORS, False)
         self.option_device_controls = options.get(CONF_ENABLE_DEVICE_CONTROLS, False)
+        self.option_status_scan_interval = options.get(CONF_STATUS_SCAN_INTERVAL, DEFAULT_STATUS_SCAN_INTERVAL)
+        self.option_devices_scan_interval = options.get(CONF_DEVICES_SCAN_INTERVAL, DEFAULT_DEVICES_SCAN_INTERVAL)
+        self.option_details_scan_interval = options.get(CONF_DETAILS_SCAN_INTERVAL, DEFAULT_DETAILS_SCAN_INTERVAL)
+        self.option_clients_scan_interval = options.get(CONF_CLIENTS_SCAN_INTERVAL, DEFAULT_CLIENTS_SCAN_INTERVAL)
+        self.option_known_clients_scan_interval = options.get(CONF_KNOWN_CLIENTS_SCAN_INTERVAL,
+                                                              DEFAULT_KNOWN_CLIENTS_SCAN_INTERVAL)
+        self.option_ssids_scan_interval = options.get(CONF_SSIDS_SCAN_INTERVAL, DEFAULT_SSIDS_SCAN_INTERVAL)
+        self.option_adaptive_polling = options.get(CONF_ADAPTIVE_POLLING, False)
+        self.option_adaptive_polling_max_interval = options.get(CONF_ADAPTIVE_POLLING_MAX_INTERVAL,
+                                                                DEFAULT_ADAPTIVE_POLLING_MAX_INTERVAL)
+        self.option_poll_overlap_policy = options.get(CONF_POLL_OVERLAP_POLICY, POLL_OVERLAP_SKIP)
+        self._poll_backoff = 1.0
 
     @property
     def username(self):
@@ -104,6 +205,39 @@ class OmadaController:
     def disconnect_timeout(self):
         return self._config_entry.data[CONF_DISCONNECT_TIMEOUT]
 
+    @property
+    def scan_intervals(self) -> Dict[str, timedelta]:
+        """Interval at which each enabled collection should be polled."""
+        intervals = {
+            STATUS: timedelta(seconds=self.option_status_scan_interval),
+            SSIDS: timedelta(seconds=self.option_ssids_scan_interval),
+        }
+
+        if self.option_track_devices:
+            intervals[DEVICES] = timedelta(seconds=self.option_devices_scan_interval)
+            intervals[DETAILS] = timedelta(seconds=self.option_details_scan_interval)
+
+        if self.option_track_clients:
+            intervals[CLIENTS] = timedelta(seconds=self.option_clients_scan_interval)
+            intervals[KNOWN_CLIENTS] = timedelta(seconds=self.option_known_clients_scan_interval)
+
+        return intervals
+
+    @property
+    def poll_interval(self) -> timedelta:
+        """Interval of the polling timer. Each tick only polls the collections that are due."""
+        return min(self.scan_intervals.values())
+
+    @property
+    def changed_macs(self) -> set[str]:
+        """Macs of the clients and devices added or modified during the last poll."""
+        macs = set()
+        for collection, changes in self.changes.items():
+            if collection not in (STATUS, SSIDS):
+                macs |= changes.added
+                macs |= changes.modified.keys()
+        return macs
+
     @property
     def signal_update(self):
         return f"{OMADA_DOMAIN}-update-{self._config_entry.entry_id}"
@@ -112,10 +246,24 @@ class OmadaController:
     def signal_options_update(self):
         return f"{OMADA_DOMAIN}-options-{self._config_entry.entry_id}"
 
+    @property
+    def signal_available(self):
+        return f"{OMADA_DOMAIN}-available-{self._config_entry.entry_id}"
+
+    def signal_mac_update(self, mac: str) -> str:
+        """Signal sent when the client or device with the given mac changed during a poll."""
+        return f"{OMADA_DOMAIN}-update-{self._config_entry.entry_id}-{mac}"
+
+    def signal_collection_update(self, collection: str) -> str:
+        """Signal sent when anything within a collection changed during a poll."""
+        return f"{OMADA_DOMAIN}-{collection}-{self._config_entry.entry_id}"
+
     async def async_setup(self):
+        session_state = await self._store.async_load()
+
         try:
             self.api = await get_api_controller(
-                self.hass, self.url, self.username, self.password, self.site, self.verify_ssl
+                self.hass, self.url, self.username, self.password, self.site, self.verify_ssl, session_state
             )
         except LoginFailed as err:
             raise ConfigEntryAuthFailed from err
@@ -126,50 +274,363 @@ class OmadaController:
 
         await self.async_update()
 
-        self.async_on_close(async_track_time_interval(
-            self.hass, self.async_update, SCAN_INTERVAL))
+        self.async_schedule_polling()
+        self.async_on_close(self._async_cancel_polling)
 
         self._config_entry.add_update_listener(self.async_config_entry_updated)
 
+    @callback
+    def _async_save_session(self) -> None:
+        self._saved_token_acquired = self.api.token_acquired
+        self._store.async_delay_save(self.api.session_state, SESSION_SAVE_DELAY)
+
+    @staticmethod
+    async def async_remove_session(hass, config_entry) -> None:
+        """Remove the stored login session of a config entry."""
+        await Store(hass, STORAGE_VERSION, f"{OMADA_DOMAIN}.{config_entry.entry_id}", private=True).async_remove()
+
+    @callback
+    def async_schedule_polling(self) -> None:
+        """(Re)start the polling timer at the shortest scan interval."""
+        self._async_cancel_polling()
+        self._cancel_polling = async_track_time_interval(
+            self.hass, self._async_poll_tick, self.poll_interval)
+
+    @callback
+    def _async_cancel_polling(self) -> None:
+        if self._cancel_polling is not None:
+            self._cancel_polling()
+            self._cancel_polling = None
+
+    @callback
+    def _async_poll_tick(self, now: datetime) -> None:
+        """Start a poll, applying the overlap policy when the previous one is still running."""
+
+        self.poll_stats.ticks += 1
+
+        if self._poll_task is None:
+            self._async_start_poll(now)
+            return
+
+        self.poll_stats.overlaps += 1
+
+        running = time.monotonic() - self._poll_started
+        if running >= POLL_STUCK_AFTER and not self._poll_reported_stuck:
+            self._poll_reported_stuck = True
+            self.poll_stats.stuck += 1
+            LOGGER.warning("Polling Omada has been running for %.0fs", running)
+
+        if self.option_poll_overlap_policy == POLL_OVERLAP_CANCEL and running >= POLL_STUCK_AFTER:
+            # Only stuck polls are cancelled, polls that are merely slow would otherwise never get to finish.
+            LOGGER.debug("Cancelling poll that has been running for %.1fs", running)
+            self.poll_stats.cancelled += 1
+            self._poll_task.cancel()
+            # Whatever the cancelled poll didn't get to is due again.
+            for collection in self._polling:
+                self._last_polled.pop(collection, None)
+            self._async_start_poll(now)
+        elif self.option_poll_overlap_policy == POLL_OVERLAP_QUEUE and not self._poll_queued:
+            LOGGER.debug("Previous poll still running, polling again once it finishes")
+            self.poll_stats.queued += 1
+            self._poll_queued = True
+        else:
+            LOGGER.debug("Previous poll still running, skipping this one")
+            self.poll_stats.skipped += 1
+
+    @callback
+    def _async_start_poll(self, now: datetime) -> None:
+        self._poll_started = time.monotonic()
+        self._poll_reported_stuck = False
+        self._poll_task = self._config_entry.async_create_background_task(
+            self.hass, self.async_update(now), f"{OMADA_DOMAIN} poll {self._config_entry.entry_id}")
+        self._poll_task.add_done_callback(self._async_poll_done)
+
+    @callback
+    def _async_poll_done(self, task: asyncio.Task) -> None:
+        if task is not self._poll_task:
+            # A cancelled poll that was already replaced.
+            return
+
+        self._poll_task = None
+        duration = time.monotonic() - self._poll_started
+        self.poll_stats.longest = max(self.poll_stats.longest, duration)
+
+        if not task.cancelled():
+            if duration > self.poll_interval.total_seconds():
+                self.poll_stats.overruns += 1
+                LOGGER.debug("Poll took %.1fs, longer than the poll interval", duration)
+            if (err := task.exception()) is not None:
+                LOGGER.error("Unexpected error while polling Omada", exc_info=err)
+
+        if self._poll_queued:
+            self._poll_queued = False
+            # Cancelled polls are either replaced already or the config entry is being unloaded.
+            if not task.cancelled():
+                self._async_start_poll(dt_util.utcnow())
+
+    def _collections_due(self, now: datetime) -> set[str]:
+        """Return the collections whose scan interval has elapsed."""
+
+        # Timer ticks drift slightly, allow half a tick of slack so a collection isn't pushed back a whole tick.
+        slack = self.poll_interval / 2
+
+        return {
+            collection for collection, interval in self.scan_intervals.items()
+            if (collection not in self._last_polled or
+                self._last_polled[collection] + self._adapt_interval(interval) - slack <= now)
+        }
+
+    def _adapt_interval(self, interval: timedelta) -> timedelta:
+        """Stretch a scan interval by the current backoff, without exceeding the adaptive polling ceiling."""
+        if not self.option_adaptive_polling:
+            return interval
+
+        ceiling = max(interval, timedelta(seconds=self.option_adaptive_polling_max_interval))
+        return min(interval * self._poll_backoff, ceiling)
+
+    def _poll_found_activity(self) -> bool:
+        """Return whether the last poll found clients or devices coming, going or changing status."""
+
+        for collection in (CLIENTS, DEVICES):
+            if (changes := self.changes.get(collection)) and (changes.added or changes.removed):
+                return True
+
+        if devices_changes := self.changes.get(DEVICES):
+            if any("status" in fields for fields in devices_changes.modified.values()):
+                return True
+
+        return bool(self.api.devices.by_status(DEVICE_STATUS_UPGRADING))
+
+    @callback
+    def async_notify_activity(self) -> None:
+        """Poll at the configured scan intervals again, e.g. after an entity changed something on the controller."""
+        self._poll_backoff = 1.0
+
+    def _update_poll_backoff(self) -> None:
+        if not self.option_adaptive_polling:
+            return
+
+        if self._poll_found_activity():
+            self._poll_backoff = 1.0
+        else:
+            # Once every collection has reached the ceiling there is no point in growing any further.
+            max_backoff = self.option_adaptive_polling_max_interval / self.poll_interval.total_seconds()
+            self._poll_backoff = min(self._poll_backoff * ADAPTIVE_POLLING_BACKOFF, max(1.0, max_backoff))
+
     async def async_update(self, event_time: datetime = None):
 
-        LOGGER.debug("Polling controller...")
+        now = dt_util.utcnow()
 
-        available = False
-        update_all: bool = (event_time is None or self._last_full_update is None or
-                            self._last_full_update <= event_time - DETAILS_SCAN_INTERVAL)
+        if event_time is None:
+            # Requested outside of the timer, update everything.
+            due = set(self.scan_intervals)
+        else:
+            due = self._collections_due(now)
 
-        for _ in range(2):
-            try:
-                await self.api.update_status()
+        if not due:
+            return
 
-                if self.option_track_devices:
-                    await self.api.devices.update(update_details=update_all)
+        if DETAILS in due:
+            # Details are fetched for the devices in the device list, so refresh that as well.
+            due.add(DEVICES)
 
-                if self.option_track_clients:
-                    await self.api.clients.update()
-                    await self.api.known_clients.update()
+        LOGGER.debug("Polling controller for %s...", ", ".join(sorted(due)))
 
-                available = True
+        poll_start = time.perf_counter()
+        timing = PollTiming(started=now)
+
+        for collection in due:
+            self._last_polled[collection] = now
+        self._polling = due
+
+        self.changes = {}
+
+        status = (self.api.name, self.api.rf_planning)
+
+        pending: Dict[str, Callable[[], Awaitable[None]]] = {}
+        if STATUS in due:
+            pending[STATUS] = self.api.update_status
+        if DEVICES in due:
+            pending[DEVICES] = lambda: self._async_update_devices(DETAILS in due)
+        if CLIENTS in due:
+            pending[CLIENTS] = lambda: self._async_update_collection(CLIENTS, self.api.clients)
+        if KNOWN_CLIENTS in due:
+            pending[KNOWN_CLIENTS] = lambda: self._async_update_collection(KNOWN_CLIENTS, self.api.known_clients)
+        if SSIDS in due:
+            pending[SSIDS] = self._async_update_ssids
+
+        if self.api.token_expiring:
+            try:
+                await self.api.renew_token()
+            except OmadaApiException as err:
+                LOGGER.warning("Unable to renew the Omada login token ahead of its expiry: %s", err)
 
+        token_acquired = self.api.token_acquired
+        succeeded = False
+
+        for _ in range(2):
+            # Collections are independent of each other, so poll them all at once and only retry the ones that failed.
+            results = await asyncio.gather(*(self._async_timed(timing, collection, update)
+                                             for collection, update in pending.items()), return_exceptions=True)
+
+            failed: Dict[str, Callable[[], Awaitable[None]]] = {}
+            renew_login = False
+
+            for (collection, update), result in zip(pending.items(), results):
+                if result is None:
+                    succeeded = True
+                    continue
+
+                failed[collection] = update
+
+                if isinstance(result, LoginRequired):
+                    LOGGER.warning(
+                        "Token possibly expired to Omada API while updating %s. Renewing...", collection)
+                    renew_login = True
+                elif isinstance(result, RequestError):
+                    LOGGER.error(
+                        "Unable to connect to Omada while updating %s: %s. Renewing login...", collection, result)
+                    renew_login = True
+                elif isinstance(result, OmadaApiException):
+                    LOGGER.error("Omada API error while updating %s: %s", collection, result)
+                else:
+                    raise result
+
+            if not failed:
                 break
-            except LoginRequired:
-                LOGGER.warning(
-                    "Token possibly expired to Omada API. Renewing...")
-                await self.api.login()
-            except RequestError as err:
-                LOGGER.error(
-                    "Unable to connect to Omada: %s. Renewing login...", err)
-                await self.api.login()
+
+            pending = failed
+
+            # Skip renewing when the token was already renewed elsewhere while these requests were failing.
+            if renew_login and self.api.token_acquired == token_acquired:
+                try:
+                    await self.api.login()
+                except OmadaApiException as err:
+                    LOGGER.error("Unable to renew login to Omada: %s", err)
+                    break
+
+        if succeeded and KNOWN_CLIENTS not in due and self._known_clients_outdated():
+            try:
+                await self._async_timed(timing, KNOWN_CLIENTS, lambda: self._async_update_collection(
+                    KNOWN_CLIENTS, self.api.known_clients))
+                self._last_polled[KNOWN_CLIENTS] = now
+            except OmadaApiException as err:
+                LOGGER.error("Omada API error while updating %s: %s", KNOWN_CLIENTS, err)
+
+        if succeeded and self.changes.get(SSIDS) and DETAILS in self.scan_intervals:
+            # Switches of new SSIDs would show the stale SSID overrides until the details are next due. The details
+            # could have been fetched before the change was seen if they were due as well, so fetch them again.
+            try:
+                await self._async_timed(timing, DETAILS, lambda: self._async_update_devices(True))
+                self._last_polled[DEVICES] = self._last_polled[DETAILS] = now
             except OmadaApiException as err:
-                LOGGER.error("Omada API error: %s", err)
+                LOGGER.error("Omada API error while updating %s: %s", DETAILS, err)
+
+        # Results from collections that did update are kept, so only report unavailable when nothing could be reached.
+        available = succeeded
+
+        if status != (self.api.name, self.api.rf_planning):
+            self.changes[STATUS] = ChangeSet(modified={self.api.controller_id: {"status"}})
 
+        available_changed = self.available != available
         self.available = available
-        if update_all:
-            self._last_full_update = dt_util.now()
 
+        if event_time is not None:
+            self._update_poll_backoff()
+
+        if self.api.token_acquired != self._saved_token_acquired:
+            self._async_save_session()
+
+        if DETAILS in due:
+            timing.details = self.api.devices.details_duration
+
+        dispatch_start = time.perf_counter()
+        self.async_dispatch_changes(available_changed)
+        timing.dispatch = time.perf_counter() - dispatch_start
+
+        timing.total = time.perf_counter() - poll_start
+        self.poll_timings.append(timing)
+
+    @staticmethod
+    async def _async_timed(timing: PollTiming, collection: str, update: Callable[[], Awaitable[None]]) -> None:
+        start = time.perf_counter()
+        try:
+            await update()
+        finally:
+            timing.collections[collection] = timing.collections.get(collection, 0.0) + time.perf_counter() - start
+
+    @callback
+    def async_record_entity_write(self, duration: float) -> None:
+        """Attribute an entity state write to the last poll."""
+        if self.poll_timings:
+            timing = self.poll_timings[-1]
+            timing.entity_writes += 1
+            timing.entity_write_time += duration
+
+    @callback
+    def async_dispatch_changes(self, available_changed: bool) -> None:
+        """Notify only the entities affected by the last poll."""
+
+        # Platforms use the general update signal to look for new items.
         async_dispatcher_send(self.hass, self.signal_update)
 
+        if available_changed:
+            async_dispatcher_send(self.hass, self.signal_available)
+
+        # Every poll makes requests, so request metrics always change.
+        async_dispatcher_send(self.hass, self.signal_collection_update(METRICS))
+
+        changed_macs = set()
+        for collection, changes in self.changes.items():
+            if changes:
+                async_dispatcher_send(self.hass, self.signal_collection_update(collection))
+                if collection not in (STATUS, SSIDS):
+                    changed_macs |= changes.keys
+
+        for mac in changed_macs:
+            async_dispatcher_send(self.hass, self.signal_mac_update(mac))
+
+    async def _async_update_devices(self, update_details: bool) -> None:
+        await self._async_update_collection(DEVICES, self.api.devices, update_details)
+
+        if update_details and self.api.devices.details_duration > self.option_devices_scan_interval:
+            LOGGER.warning("Updating device details took %.1fs which is longer than the devices scan interval.",
+                           self.api.devices.details_duration)
+
+    async def _async_update_ssids(self) -> None:
+        previous = self.api.ssids
+
+        if await self.api.update_ssids():
+            self._record_changes(SSIDS, ChangeSet(added=self.api.ssids - previous, removed=previous - self.api.ssids))
+            # SSID switches are registered per SSID, so every mac has to be evaluated again like after an options change.
+            self._options_generation += 1
+            # Switches read their state from the SSID overrides in the AP details, which are cached.
+            self.api.devices.invalidate_all_details()
+            self._async_save_session()
+
+    async def _async_update_collection(self, collection: str, items: APIItems, update_details: bool = False) -> None:
+        self._record_changes(collection, await items.update(update_details=update_details))
+
+    def _known_clients_outdated(self) -> bool:
+        """Return whether clients came or went since known clients were last updated, so they can't wait for their
+        schedule. Client entities need the known client record of new clients, and the disconnect timeout of clients
+        that left counts from their last seen time."""
+
+        if not (changes := self.changes.get(CLIENTS)):
+            return False
+
+        if any(mac not in self.api.known_clients for mac in changes.added):
+            return True
+
+        return bool(changes.removed and self.option_disconnect_timeout)
+
+    def _record_changes(self, collection: str, changes: ChangeSet) -> None:
+        """Keep the changes a collection reported during the current poll."""
+        if collection in self.changes:
+            self.changes[collection].merge(changes)
+        else:
+            self.changes[collection] = changes
+
     @callback
     def async_on_close(self, func: CALLBACK_TYPE) -> None:
         """Add a function to call when router is closed."""
@@ -193,8 +654,12 @@ class OmadaController:
         descriptions: Dict[str, OmadaEntityDescription],
         async_add_entities: AddEntitiesCallback
     ):
-        """Load requested platform entities for each mac address when not already added"""
+        """Load requested platform entities for each mac address when not already added.
+
+        Every mac is only evaluated the first time a description is registered and after the options changed. Otherwise
+        only the macs added or modified during the last poll are evaluated."""
         entities: list[OmadaEntity] = []
+        changed_macs: set[str] | None = None
 
         for description in descriptions.values():
 
@@ -203,7 +668,16 @@ class OmadaController:
             if description.key not in self.entities[description.domain]:
                 self.entities[description.domain][description.key] = set()
 
-            for mac in macs:
+            registered_key = (description.domain, description.key)
+            if self._registered_generation.get(registered_key) == self._options_generation:
+                if changed_macs is None:
+                    changed_macs = self.changed_macs
+                candidate_macs = [mac for mac in changed_macs if mac in macs]
+            else:
+                candidate_macs = macs
+                self._registered_generation[registered_key] = self._options_generation
+
+            for mac in candidate_macs:
                 if (mac not in self.entities[description.domain][description.key] and
                         description.allowed_fn(self, mac) and description.supported_fn(self, mac)):
 
@@ -268,10 +742,11 @@ class OmadaController:
             return
 
         controller.load_config_entry_options()
+        controller.async_schedule_polling()
         async_dispatcher_send(hass, controller.signal_options_update)
 
 
-async def get_api_controller(hass, url, username, password, site, verify_ssl):
+async def get_api_controller(hass, url, username, password, site, verify_ssl, session_state=None):
     ssl_context = None
 
     if verify_ssl:
@@ -283,10 +758,19 @@ async def get_api_controller(hass, url, username, password, site, verify_ssl):
             hass, verify_ssl=verify_ssl, cookie_jar=CookieJar(unsafe=True)
         )
 
+    # Entities only read item properties, so there is no need to hold on to the full raw items.
     controller = Controller(url, username, password,
-                            session, site=site, ssl_context=ssl_context)
+                            session, site=site, ssl_context=ssl_context, compact_items=True)
 
     try:
+        if session_state and controller.restore_session(session_state):
+            try:
+                await controller.update_status()
+                LOGGER.debug("Resumed stored session to Omada at %s", url)
+                return controller
+            except OmadaApiException as err:
+                LOGGER.debug("Unable to resume stored session to Omada at %s, logging in: %s", url, err)
+
         await controller.login()
 
         await controller.update_status()
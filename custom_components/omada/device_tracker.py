@@ -10,10 +10,11 @@ from typing import Any, Dict, Mapping
 from homeassistant.components.device_tracker import DOMAIN
 from homeassistant.components.device_tracker.config_entry import ScannerEntity
 from homeassistant.components.device_tracker.const import SourceType
-from homeassistant.core import callback
+from homeassistant.core import CALLBACK_TYPE, callback
 from homeassistant.helpers import device_registry
 from homeassistant.helpers.entity import DeviceInfo
 from homeassistant.helpers.dispatcher import async_dispatcher_connect
+from homeassistant.helpers.event import async_call_later
 
 from .api.controller import Controller
 from .api.clients import Client
@@ -62,6 +63,14 @@ DISCONNECTED_CLIENT_ATTRIBUTES = (
     "last_seen"
 )
 
+# Raw fields the client attributes are read from, attributes are only rebuilt when one of them changes.
+CONNECTED_CLIENT_FIELDS = (
+    "name", "hostName", "ip", "mac", "wireless", "ssid", "apMac", "apName", "channel", "radioId", "wifiMode",
+    "signalLevel", "rssi", "powerSave", "guest"
+)
+
+DISCONNECTED_CLIENT_FIELDS = ("name", "mac", "wireless", "guest", "lastSeen")
+
 DEVICE_ATTRIBUTES = [
     "type",
     "model",
@@ -98,6 +107,17 @@ def client_connected_fn(controller: OmadaController, mac: str) -> bool:
              controller.api.known_clients[mac].last_seen > (time.time() * 1000) - (controller.option_disconnect_timeout * 60000)))
 
 
+@callback
+def client_connected_until_fn(controller: OmadaController, mac: str) -> float | None:
+    """Retrieve the time a disconnected client will stop being considered connected due to option_disconnect_timeout"""
+    if (mac in controller.api.clients or
+            mac not in controller.api.known_clients or
+            not controller.option_disconnect_timeout):
+        return None
+
+    return (controller.api.known_clients[mac].last_seen / 1000) + (controller.option_disconnect_timeout * 60)
+
+
 @callback
 def client_attributes_fn(controller: OmadaController, mac: str) -> bool:
     """Retrieve extra attributes for clients"""
@@ -118,15 +138,26 @@ def client_attributes_fn(controller: OmadaController, mac: str) -> bool:
         client = controller.api.known_clients[mac]
 
     for k in target_attrs:
-        if hasattr(client, k) and getattr(client, k):
+        if value := getattr(client, k, None):
             if k in ["mac", "ap_mac"]:
-                attributes[k] = device_registry.format_mac(
-                    getattr(client, k))
+                attributes[k] = device_registry.format_mac(value)
             else:
-                attributes[k] = getattr(client, k)
+                attributes[k] = value
 
     return attributes
 
+
+@callback
+def client_attributes_key_fn(controller: OmadaController, mac: str) -> tuple:
+    """Identify the client the attributes are read from and the values of the fields they're built from."""
+    if mac in controller.api.clients:
+        client = controller.api.clients[mac]
+        return client, client.field_values(CONNECTED_CLIENT_FIELDS)
+    if mac in controller.api.known_clients:
+        client = controller.api.known_clients[mac]
+        return client, client.field_values(DISCONNECTED_CLIENT_FIELDS)
+    return ()
+
 @callback
 def device_name_fn(api: Controller, mac: str, _) -> str:
     if mac in api.devices:
@@ -159,8 +190,11 @@ def device_attributes_fn(controller: OmadaController, mac: str) -> bool:
 @dataclass
 class OmadaDeviceTrackerEntityDescriptionMixin():
     connected_fn: Callable[[OmadaController, str], bool]
+    connected_until_fn: Callable[[OmadaController, str], float | None]
     extra_attributes_fn: Callable[[
         OmadaController, str], Mapping[str, Any] | None]
+    # Attributes are cached until the returned key changes. None rebuilds them on every state write.
+    attributes_key_fn: Callable[[OmadaController, str], Any] | None
 
 
 @dataclass
@@ -184,7 +218,9 @@ CLIENT_ENTITY_DESCRIPTIONS: Dict[str, OmadaDeviceTrackerEntityDescription] = {
         name_fn=client_name_fn,
         unique_id_fn=lambda mac, _: mac,
         connected_fn=client_connected_fn,
-        extra_attributes_fn=client_attributes_fn
+        connected_until_fn=client_connected_until_fn,
+        extra_attributes_fn=client_attributes_fn,
+        attributes_key_fn=client_attributes_key_fn
     )
 }
 
@@ -200,7 +236,9 @@ DEVICE_ENTITY_DESCRIPTIONS: Dict[str, OmadaDeviceTrackerEntityDescription] = {
         name_fn=device_name_fn,
         unique_id_fn=lambda mac, _: mac,
         connected_fn=device_connected_fn,
-        extra_attributes_fn=device_attributes_fn
+        connected_until_fn=lambda *_: None,
+        extra_attributes_fn=device_attributes_fn,
+        attributes_key_fn=None
     )
 }
 
@@ -249,13 +287,67 @@ class OmadaDeviceTrackerEntity(OmadaEntity, ScannerEntity):
 
     entity_description: OmadaDeviceTrackerEntityDescription
 
+    _cancel_disconnect_check: CALLBACK_TYPE | None = None
+
+    _attributes: Mapping[str, Any] | None = None
+    _attributes_key: Any = None
+    # Connected state and attributes of the last state write.
+    _written_state: tuple[bool, Mapping[str, Any] | None] | None = None
+
+    async def async_added_to_hass(self) -> None:
+        await super().async_added_to_hass()
+        self.async_on_remove(self._async_cancel_disconnect_check)
+        self._async_schedule_disconnect_check()
+
+    @callback
+    def async_write_ha_state(self) -> None:
+        self._written_state = (self.is_connected, self.extra_state_attributes)
+        super().async_write_ha_state()
+
+    @callback
+    async def async_update(self):
+        # Most changes to a client are to counters that are neither part of its state nor its attributes.
+        if (self.is_connected, self.extra_state_attributes) != self._written_state:
+            await super().async_update()
+        self._async_schedule_disconnect_check()
+
+    @callback
+    def _async_schedule_disconnect_check(self) -> None:
+        """Entities are only updated when their client changes, so schedule an update for when the disconnect
+        timeout of a client that left runs out."""
+        self._async_cancel_disconnect_check()
+
+        connected_until = self.entity_description.connected_until_fn(self.controller, self._mac)
+        if connected_until is not None and connected_until > time.time():
+            self._cancel_disconnect_check = async_call_later(
+                self.hass, connected_until - time.time(), self._async_disconnect_check)
+
+    @callback
+    def _async_cancel_disconnect_check(self) -> None:
+        if self._cancel_disconnect_check is not None:
+            self._cancel_disconnect_check()
+            self._cancel_disconnect_check = None
+
+    @callback
+    def _async_disconnect_check(self, _) -> None:
+        self._cancel_disconnect_check = None
+        self.async_write_ha_state()
+
     @property
     def is_connected(self) -> bool:
         return self.entity_description.connected_fn(self.controller, self._mac)
 
     @property
     def extra_state_attributes(self) -> Mapping[str, Any] | None:
-        return self.entity_description.extra_attributes_fn(self.controller, self._mac)
+        if self.entity_description.attributes_key_fn is None:
+            return self.entity_description.extra_attributes_fn(self.controller, self._mac)
+
+        key = self.entity_description.attributes_key_fn(self.controller, self._mac)
+        if self._attributes is None or key != self._attributes_key:
+            self._attributes = self.entity_description.extra_attributes_fn(self.controller, self._mac)
+            self._attributes_key = key
+
+        return self._attributes
 
     @property
     def unique_id(self) -> str | None:
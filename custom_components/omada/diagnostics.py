@@ -0,0 +1,85 @@
+from __future__ import annotations
+
+import sys
+
+from dataclasses import asdict
+from typing import Any
+
+from homeassistant.components.diagnostics import async_redact_data
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.const import CONF_PASSWORD, CONF_USERNAME
+from homeassistant.core import HomeAssistant
+
+from .api.api import APIItems
+from .api.controller import json_loads
+from .const import DOMAIN, CLIENTS, DEVICES, KNOWN_CLIENTS
+from .controller import OmadaController
+
+TO_REDACT = {CONF_PASSWORD, CONF_USERNAME}
+
+
+def _approximate_size(obj: Any, seen: set[int]) -> int:
+    """Size in bytes of an object and everything it references, counting shared objects once."""
+
+    if id(obj) in seen:
+        return 0
+    seen.add(id(obj))
+
+    size = sys.getsizeof(obj)
+
+    if isinstance(obj, dict):
+        size += sum(_approximate_size(key, seen) + _approximate_size(value, seen) for key, value in obj.items())
+    elif isinstance(obj, (list, tuple, set, frozenset)):
+        size += sum(_approximate_size(item, seen) for item in obj)
+    else:
+        for cls in type(obj).__mro__:
+            for slot in cls.__dict__.get("__slots__", ()):
+                if hasattr(obj, slot):
+                    size += _approximate_size(getattr(obj, slot), seen)
+
+    return size
+
+
+def _collection_diagnostics(items: APIItems) -> dict[str, Any]:
+    return {
+        "count": len(items),
+        "approximate_memory": _approximate_size(items.items, set()),
+        "fingerprint_hits": items.fingerprint_hits,
+    }
+
+
+async def async_get_config_entry_diagnostics(hass: HomeAssistant, config_entry: ConfigEntry) -> dict[str, Any]:
+    controller: OmadaController = hass.data[DOMAIN][config_entry.entry_id]
+    api = controller.api
+
+    return {
+        "config_entry": async_redact_data(config_entry.as_dict(), TO_REDACT),
+        "controller": {
+            "version": api.version,
+            "available": controller.available,
+        },
+        "caching": {
+            "fingerprint_hits": api.fingerprint_hits,
+            "coalesced_requests": api.coalesced_requests,
+            "device_details_cache_hits": api.devices.details_cache_hits,
+        },
+        "collections": {
+            CLIENTS: _collection_diagnostics(api.clients),
+            KNOWN_CLIENTS: _collection_diagnostics(api.known_clients),
+            DEVICES: _collection_diagnostics(api.devices),
+        },
+        "entities": {
+            domain: {key: len(macs) for key, macs in keys.items()}
+            for domain, keys in controller.entities.items()
+        },
+        "polls": [asdict(timing) for timing in controller.poll_timings],
+        "poll_stats": {
+            **asdict(controller.poll_stats),
+            "missed": controller.poll_stats.missed,
+        },
+        "decoding": {
+            "decoder": json_loads.__module__,
+            **asdict(api.decode_stats),
+        },
+        "requests": api.metrics.as_dict(),
+    }
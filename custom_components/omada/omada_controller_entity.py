@@ -1,6 +1,7 @@
 from __future__ import annotations
 
 import logging
+import time
 
 from collections.abc import Callable
 from dataclasses import dataclass
@@ -10,7 +11,7 @@ from homeassistant.core import callback
 from homeassistant.helpers.entity import Entity, EntityDescription, DeviceInfo
 from homeassistant.helpers.dispatcher import async_dispatcher_connect
 
-from .const import ATTR_MANUFACTURER as ATTR_OMADA_MANUFACTURER, ATTR_CONTROLLER_MODEL, DOMAIN
+from .const import ATTR_MANUFACTURER as ATTR_OMADA_MANUFACTURER, ATTR_CONTROLLER_MODEL, DOMAIN, STATUS
 from .api.controller import Controller
 
 if TYPE_CHECKING:
@@ -71,9 +72,20 @@ class OmadaControllerEntity(Entity):
         self._attr_name = description.name_fn(controller.api, description.key)
 
     async def async_added_to_hass(self) -> None:
-        self.async_on_remove(
-            async_dispatcher_connect(self.hass, self.controller.signal_update, self.async_update))
+        for signal, method in (
+            (self.controller.signal_available, self.async_available_updated),
+            (self.controller.signal_collection_update(STATUS), self.async_update)
+        ):
+            self.async_on_remove(
+                async_dispatcher_connect(self.hass, signal, method))
+
+    @callback
+    async def async_available_updated(self):
+        self._attr_available = self.entity_description.available_fn(self.controller)
+        self.async_write_ha_state()
 
     @callback
     async def async_update(self):
+        start = time.perf_counter()
         self.async_write_ha_state()
+        self.controller.async_record_entity_write(time.perf_counter() - start)
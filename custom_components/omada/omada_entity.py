@@ -1,6 +1,7 @@
 from __future__ import annotations
 
 import logging
+import time
 
 from collections.abc import Callable
 from dataclasses import dataclass
@@ -97,7 +98,8 @@ class OmadaEntity(Entity):
     async def async_added_to_hass(self) -> None:
         for signal, method in (
             (self.controller.signal_options_update, self.options_updated),
-            (self.controller.signal_update, self.async_update)
+            (self.controller.signal_available, self.async_available_updated),
+            (self.controller.signal_mac_update(self._mac), self.async_update)
         ):
             self.async_on_remove(
                 async_dispatcher_connect(self.hass, signal, method))
@@ -108,6 +110,13 @@ class OmadaEntity(Entity):
 
     @callback
     async def async_update(self):
+        start = time.perf_counter()
+        self.async_write_ha_state()
+        self.controller.async_record_entity_write(time.perf_counter() - start)
+
+    @callback
+    async def async_available_updated(self):
+        self._attr_available = self.entity_description.available_fn(self.controller, self._mac)
         self.async_write_ha_state()
 
     @callback
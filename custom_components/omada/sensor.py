@@ -8,8 +8,8 @@ from datetime import datetime, timedelta
 from typing import Dict, Any
 
 from homeassistant.components.sensor import (DOMAIN, SensorDeviceClass, SensorEntity,
-                                             SensorEntityDescription)
-from homeassistant.const import UnitOfInformation, UnitOfDataRate, PERCENTAGE
+                                             SensorEntityDescription, SensorStateClass)
+from homeassistant.const import UnitOfInformation, UnitOfDataRate, UnitOfTime, PERCENTAGE
 from homeassistant.core import callback
 from homeassistant.helpers.entity import EntityCategory
 from homeassistant.helpers.dispatcher import async_dispatcher_connect
@@ -17,9 +17,15 @@ from homeassistant.util import dt as dt_util
 
 from .controller import OmadaController
 
-from .const import (DOMAIN as OMADA_DOMAIN, CLIENTS)
+from .const import (DOMAIN as OMADA_DOMAIN, CLIENTS, METRICS)
 from .omada_entity import (OmadaEntity, OmadaEntityDescription, device_device_info_fn,
                            client_device_info_fn, unique_id_fn)
+from .omada_controller_entity import (
+    OmadaControllerEntity,
+    OmadaControllerEntityDescription,
+    device_info_fn as controller_device_info_fn,
+    unique_id_fn as controller_unique_id_fn,
+)
 
 DOWNLOAD_SENSOR = "downloaded"
 UPLOAD_SENSOR = "uploaded"
@@ -43,6 +49,12 @@ RX_UTILIZATION_6G_SENSOR = "6ghz_rx_utilization"
 INTER_UTILIZATION_2G_SENSOR = "2ghz_interference_utilization"
 INTER_UTILIZATION_5G_SENSOR = "5ghz_interference_utilization"
 INTER_UTILIZATION_6G_SENSOR = "6ghz_interference_utilization"
+API_REQUESTS_SENSOR = "api_requests"
+API_ERRORS_SENSOR = "api_errors"
+API_LATENCY_SENSOR = "api_latency"
+API_RECEIVED_SENSOR = "api_received"
+MISSED_POLLS_SENSOR = "missed_polls"
+POLL_OVERRUNS_SENSOR = "poll_overruns"
 
 LOGGER = logging.getLogger(__name__)
 
@@ -246,6 +258,25 @@ class OmadaSensorEntityDescription(
     value_format_fn: Callable[[Any], Any] | None = None
 
 
+@dataclass
+class OmadaControllerSensorEntityDescriptionMixin():
+    value_fn: Callable[[OmadaController], float | int | None]
+
+
+@dataclass
+class OmadaControllerSensorEntityDescription(
+    SensorEntityDescription,
+    OmadaControllerEntityDescription,
+    OmadaControllerSensorEntityDescriptionMixin
+):
+    """Omada Controller Sensor Entity Description"""
+
+
+def api_latency_value_fn(controller: OmadaController) -> float | None:
+    latency = controller.api.metrics.average_latency
+    return round(latency * 1000, 1) if latency is not None else None
+
+
 CLIENT_ENTITY_DESCRIPTIONS: Dict[str, OmadaSensorEntityDescription] = {
     DOWNLOAD_SENSOR: OmadaSensorEntityDescription(
         domain=DOMAIN,
@@ -675,9 +706,105 @@ DEVICE_ENTITY_DESCRIPTIONS: Dict[str, OmadaSensorEntityDescription] = {
 }
 
 
+# Request metrics of the API, mostly useful for tuning the scan intervals.
+CONTROLLER_ENTITY_DESCRIPTIONS: Dict[str, OmadaControllerSensorEntityDescription] = {
+    API_REQUESTS_SENSOR: OmadaControllerSensorEntityDescription(
+        domain=DOMAIN,
+        key=API_REQUESTS_SENSOR,
+        entity_category=EntityCategory.DIAGNOSTIC,
+        entity_registry_enabled_default=False,
+        state_class=SensorStateClass.TOTAL_INCREASING,
+        has_entity_name=True,
+        icon="mdi:swap-vertical",
+        available_fn=lambda controller: controller.available,
+        device_info_fn=controller_device_info_fn,
+        name_fn=lambda *_: "API Requests",
+        unique_id_fn=controller_unique_id_fn,
+        value_fn=lambda controller: controller.api.metrics.count
+    ),
+    API_ERRORS_SENSOR: OmadaControllerSensorEntityDescription(
+        domain=DOMAIN,
+        key=API_ERRORS_SENSOR,
+        entity_category=EntityCategory.DIAGNOSTIC,
+        entity_registry_enabled_default=False,
+        state_class=SensorStateClass.TOTAL_INCREASING,
+        has_entity_name=True,
+        icon="mdi:alert-circle-outline",
+        available_fn=lambda controller: controller.available,
+        device_info_fn=controller_device_info_fn,
+        name_fn=lambda *_: "API Errors",
+        unique_id_fn=controller_unique_id_fn,
+        value_fn=lambda controller: controller.api.metrics.error_count
+    ),
+    API_LATENCY_SENSOR: OmadaControllerSensorEntityDescription(
+        domain=DOMAIN,
+        key=API_LATENCY_SENSOR,
+        entity_category=EntityCategory.DIAGNOSTIC,
+        entity_registry_enabled_default=False,
+        device_class=SensorDeviceClass.DURATION,
+        native_unit_of_measurement=UnitOfTime.MILLISECONDS,
+        state_class=SensorStateClass.MEASUREMENT,
+        has_entity_name=True,
+        available_fn=lambda controller: controller.available,
+        device_info_fn=controller_device_info_fn,
+        name_fn=lambda *_: "API Average Latency",
+        unique_id_fn=controller_unique_id_fn,
+        value_fn=api_latency_value_fn
+    ),
+    API_RECEIVED_SENSOR: OmadaControllerSensorEntityDescription(
+        domain=DOMAIN,
+        key=API_RECEIVED_SENSOR,
+        entity_category=EntityCategory.DIAGNOSTIC,
+        entity_registry_enabled_default=False,
+        device_class=SensorDeviceClass.DATA_SIZE,
+        native_unit_of_measurement=UnitOfInformation.BYTES,
+        suggested_unit_of_measurement=UnitOfInformation.MEGABYTES,
+        state_class=SensorStateClass.TOTAL_INCREASING,
+        has_entity_name=True,
+        available_fn=lambda controller: controller.available,
+        device_info_fn=controller_device_info_fn,
+        name_fn=lambda *_: "API Data Received",
+        unique_id_fn=controller_unique_id_fn,
+        value_fn=lambda controller: controller.api.metrics.bytes
+    ),
+    MISSED_POLLS_SENSOR: OmadaControllerSensorEntityDescription(
+        domain=DOMAIN,
+        key=MISSED_POLLS_SENSOR,
+        entity_category=EntityCategory.DIAGNOSTIC,
+        entity_registry_enabled_default=False,
+        state_class=SensorStateClass.TOTAL_INCREASING,
+        has_entity_name=True,
+        icon="mdi:timer-alert-outline",
+        available_fn=lambda controller: controller.available,
+        device_info_fn=controller_device_info_fn,
+        name_fn=lambda *_: "Missed Polls",
+        unique_id_fn=controller_unique_id_fn,
+        value_fn=lambda controller: controller.poll_stats.missed
+    ),
+    POLL_OVERRUNS_SENSOR: OmadaControllerSensorEntityDescription(
+        domain=DOMAIN,
+        key=POLL_OVERRUNS_SENSOR,
+        entity_category=EntityCategory.DIAGNOSTIC,
+        entity_registry_enabled_default=False,
+        state_class=SensorStateClass.TOTAL_INCREASING,
+        has_entity_name=True,
+        icon="mdi:timer-sand",
+        available_fn=lambda controller: controller.available,
+        device_info_fn=controller_device_info_fn,
+        name_fn=lambda *_: "Poll Overruns",
+        unique_id_fn=controller_unique_id_fn,
+        value_fn=lambda controller: controller.poll_stats.overruns
+    ),
+}
+
+
 async def async_setup_entry(hass, config_entry, async_add_entities):
     controller: OmadaController = hass.data[OMADA_DOMAIN][config_entry.entry_id]
 
+    # Set up Controller Entities
+    async_add_entities([OmadaControllerSensorEntity(controller, description)
+                        for description in CONTROLLER_ENTITY_DESCRIPTIONS.values()])
+
     @callback
     def items_added() -> None:
 
@@ -752,3 +879,24 @@ class OmadaSensorEntity(OmadaEntity, SensorEntity):
     async def async_update(self):
         if self.update_value():
             await super().async_update()
+
+
+class OmadaControllerSensorEntity(OmadaControllerEntity, SensorEntity):
+
+    entity_description: OmadaControllerSensorEntityDescription
+
+    def __init__(self, controller: OmadaController, description: OmadaControllerEntityDescription) -> None:
+        super().__init__(controller, description)
+        self._attr_native_value = self.entity_description.value_fn(controller)
+
+    async def async_added_to_hass(self) -> None:
+        await super().async_added_to_hass()
+
+        self.async_on_remove(async_dispatcher_connect(
+            self.hass, self.controller.signal_collection_update(METRICS), self.async_update))
+
+    @callback
+    async def async_update(self):
+        if (value := self.entity_description.value_fn(self.controller)) != self._attr_native_value:
+            self._attr_native_value = value
+            await super().async_update()
@@ -14,7 +14,7 @@ from homeassistant.helpers.dispatcher import async_dispatcher_connect
 
 from .controller import OmadaController
 from .api.controller import Controller
-from .const import DOMAIN as OMADA_DOMAIN
+from .const import DOMAIN as OMADA_DOMAIN, SSIDS
 from .omada_entity import (OmadaEntity, OmadaEntityDescription, device_device_info_fn,
                            client_device_info_fn, unique_id_fn)
 
@@ -30,6 +30,7 @@ RADIO_2G_SWITCH = "2ghz_radio"
 RADIO_5G_SWITCH = "5ghz_radio"
 RADIO_6G_SWITCH = "6ghz_radio"
 AI_OPTIMIZATION_SWITCH = "ai_optimization"
+SSID_SWITCH_PREFIX = "ssid_"
 
 LOGGER = logging.getLogger(__name__)
 
@@ -95,6 +96,28 @@ class OmadaSwitchEntityDescription(
     """Omada Switch Entity Description"""
 
 
+def ssid_entity_description(ssid: str) -> OmadaSwitchEntityDescription:
+    key = "{}{}".format(SSID_SWITCH_PREFIX, ssid.replace("-", "_"))
+    return OmadaSwitchEntityDescription(
+        domain=DOMAIN,
+        key=key,
+        device_class=SwitchDeviceClass.SWITCH,
+        entity_category=EntityCategory.CONFIG,
+        has_entity_name=True,
+        icon="mdi:wifi",
+        allowed_fn=lambda controller, _: (controller.option_device_controls and
+                                          controller.option_track_devices and
+                                          ssid in controller.api.ssids),
+        supported_fn=lambda *_: True,
+        available_fn=lambda controller, _: controller.available,
+        device_info_fn=device_device_info_fn,
+        name_fn=lambda *_: f"{ssid} WLAN",
+        unique_id_fn=unique_id_fn,
+        is_on_fn=lambda api, mac: ssid_enabled_fn(api, mac, ssid),
+        control_fn=lambda api, mac, enabled: enable_ssid_fn(api, mac, enabled, ssid)
+    )
+
+
 @dataclass
 class OmadaControllerSwitchEntityDescriptionMixin():
     control_fn: Callable[[Controller, str, bool], Coroutine[Any, Any, None]]
@@ -213,6 +236,8 @@ async def async_setup_entry(hass, config_entry, async_add_entities):
         entity = OmadaControllerSwitchEntity(controller, description)
         async_add_entities([entity])
 
+    ssid_descriptions: Dict[str, OmadaSwitchEntityDescription] = {}
+
     @callback
     def items_added() -> None:
 
@@ -230,29 +255,15 @@ async def async_setup_entry(hass, config_entry, async_add_entities):
 
                 device_descriptions = DEVICE_ENTITY_DESCRIPTIONS.copy()
 
-                # Add SSID switches
+                # Add SSID switches, only creating descriptions for SSIDs that weren't seen before.
+                for ssid in ssid_descriptions.keys() - controller.api.ssids:
+                    del ssid_descriptions[ssid]
+
                 for ssid in controller.api.ssids:
-                    key = "ssid_{}".format(ssid.replace("-", "_"))
-                    device_descriptions[key] = OmadaSwitchEntityDescription(
-                        domain=DOMAIN,
-                        key=key,
-                        device_class=SwitchDeviceClass.SWITCH,
-                        entity_category=EntityCategory.CONFIG,
-                        has_entity_name=True,
-                        icon="mdi:wifi",
-                        allowed_fn=lambda controller, _, ssid=ssid: (controller.option_device_controls and
-                                                                     controller.option_track_devices and
-                                                                     ssid in controller.api.ssids),
-                        supported_fn=lambda *_: True,
-                        available_fn=lambda controller, _: controller.available,
-                        device_info_fn=device_device_info_fn,
-                        name_fn=lambda *_, ssid=ssid: f"{ssid} WLAN",
-                        unique_id_fn=unique_id_fn,
-                        is_on_fn=lambda api, mac, s=ssid: ssid_enabled_fn(
-                            api, mac, s),
-                        control_fn=lambda api, mac, enabled, s=ssid: enable_ssid_fn(
-                            api, mac, enabled, s)
-                    )
+                    if ssid not in ssid_descriptions:
+                        ssid_descriptions[ssid] = ssid_entity_description(ssid)
+                    description = ssid_descriptions[ssid]
+                    device_descriptions[description.key] = description
 
             else:
                 device_descriptions = DEVICE_ENTITY_DESCRIPTIONS
@@ -291,13 +302,23 @@ class OmadaSwitchEntity(OmadaEntity, SwitchEntity):
         self._attr_is_on = self.entity_description.is_on_fn(
             controller.api, mac)
 
+    async def async_added_to_hass(self) -> None:
+        await super().async_added_to_hass()
+
+        if self.entity_description.key.startswith(SSID_SWITCH_PREFIX):
+            # Remove the switch once its SSID is gone.
+            self.async_on_remove(async_dispatcher_connect(
+                self.hass, self.controller.signal_collection_update(SSIDS), self.options_updated))
+
     async def async_turn_on(self, **kwargs: Any) -> None:
         await self.entity_description.control_fn(self.controller.api, self._mac, True)
+        self.controller.async_notify_activity()
         self._attr_is_on = True
         self.async_write_ha_state()
 
     async def async_turn_off(self, **kwargs: Any) -> None:
         await self.entity_description.control_fn(self.controller.api, self._mac, False)
+        self.controller.async_notify_activity()
         self._attr_is_on = False
         self.async_write_ha_state()
 
@@ -319,11 +340,13 @@ class OmadaControllerSwitchEntity(OmadaControllerEntity, SwitchEntity):
 
     async def async_turn_on(self, **kwargs: Any) -> None:
         await self.entity_description.control_fn(self.controller.api, True)
+        self.controller.async_notify_activity()
         self._attr_is_on = True
         self.async_write_ha_state()
 
     async def async_turn_off(self, **kwargs: Any) -> None:
         await self.entity_description.control_fn(self.controller.api, False)
+        self.controller.async_notify_activity()
         self._attr_is_on = False
         self.async_write_ha_state()
 
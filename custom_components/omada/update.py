@@ -121,6 +121,7 @@ class OmadaUpdateEntity(OmadaEntity, UpdateEntity):
 
     async def async_install(self, version: str | None, backup: bool, **kwargs: Any) -> None:
         await self.entity_description.update_fn(self.controller.api, self._mac)
+        self.controller.async_notify_activity()
 
     def release_notes(self) -> str | None:
         return self.entity_description.latest_version_rn_fn(self.controller.api, self._mac)